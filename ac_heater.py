@@ -1,9 +1,51 @@
 import time
+import array
 import digitalio
 import board
 import countio
 import asyncio
 
+try:
+    import rp2pio
+except ImportError:
+    rp2pio = None
+
+# Start polling for the next zero-cross this long before it is expected (seconds)
+EDGE_GUARD_TIME = 0.002
+
+# Gate pulse width in nanoseconds, for the busy-wait fallback
+PULSE_NS = 100_000
+
+# Zero-cross gate PIO program, clocked at 1MHz so one cycle is 1µs. The state machine waits for
+# each zero-cross edge itself, counts out the phase delay and fires one 100µs pulse, so neither
+# the delay nor the pulse is timed by the asyncio scheduler. The zero-cross GPIO number is OR'd
+# into the two WAIT instructions, leaving the pin claimed by countio for period measurement.
+#   0: pull noblock      ; take a new delay from the TX FIFO, or keep the last one (X)
+#   1: mov x, osr
+#   2: wait 0 gpio <zc>
+#   3: wait 1 gpio <zc>  ; rising zero-cross edge
+#   4: mov y, x
+#   5: jmp y-- 5         ; phase delay, 1µs per iteration
+#   6: set pins, 1 [31]  ; gate pulse: 32 + 32 + 32 + 4 = 100 cycles high
+#   7: nop [31]
+#   8: nop [31]
+#   9: nop [3]
+#  10: set pins, 0
+GATE_PROGRAM = (0x8080, 0xA027, 0x2000, 0x2080, 0xA041, 0x0085,
+                0xFF01, 0xBF42, 0xBF42, 0xA342, 0xE000)
+GATE_FREQUENCY = 1_000_000
+
+# Run on the stopped state machine: drive the gate low, and load the newest FIFO word into X
+# (the TX FIFO holds at most four words and `pull noblock` on an empty FIFO copies X)
+SET_PINS_LOW = array.array("H", (0xE000,))
+LOAD_DELAY = array.array("H", (0x8080, 0xA027) * 5)
+
+def gpio_number(pin):
+    """
+    Return the RP2040 GPIO number for a board pin (e.g., board.GP14 -> 14).
+    """
+    return int(str(pin).rsplit("GP", 1)[1])
+
 class AC_Heater:
     def __init__(self, zero_cross_pin, control_pin, initial_debounce_time=0.005):
         """
@@ -12,10 +54,27 @@ class AC_Heater:
         :param control_pin: The pin connected to control the heater (dimming or power control).
         :param initial_debounce_time: Initial debounce time in seconds (default 5ms).
         """
-        # Setup control pin (PWM or digital out)
-        self.control_pin = digitalio.DigitalInOut(control_pin)
-        self.control_pin.direction = digitalio.Direction.OUTPUT
-        self.control_pin.value = False
+        # Setup control pin: a PIO zero-cross gate on the RP2040, otherwise a plain digital out
+        self.gate_sm = None
+        self.control_pin = None
+        self.delay_cycles = -1  # Phase delay last pushed to the gate; -1 while it is stopped
+        if rp2pio is not None:
+            zc = gpio_number(zero_cross_pin)
+            program = array.array("H", GATE_PROGRAM)
+            program[2] |= zc
+            program[3] |= zc
+            self.gate_sm = rp2pio.StateMachine(
+                program,
+                frequency=GATE_FREQUENCY,
+                first_set_pin=control_pin,
+                initial_set_pin_state=0,
+                initial_set_pin_direction=1,
+            )
+            self.gate_sm.stop()  # Heater starts off; the state machine runs only while gating
+        else:
+            self.control_pin = digitalio.DigitalInOut(control_pin)
+            self.control_pin.direction = digitalio.Direction.OUTPUT
+            self.control_pin.value = False
 
         # Zero-crossing detector using countio
         self.zero_cross = countio.Counter(zero_cross_pin, edge=countio.Edge.RISE)
@@ -31,38 +90,89 @@ class AC_Heater:
         self.last_cycle_time = 0  # Duration of the last AC cycle
 
     async def zero_cross_task(self):
-        """Task that runs to handle zero crossing events asynchronously with self-adjusting debouncing."""
-        previous_count = self.zero_cross.count
+        """
+        Task that runs to handle zero crossing events asynchronously with self-adjusting debouncing.
+
+        countio offers no edge callback, so rather than spinning with sleep(0) the task sleeps
+        until shortly before the next expected zero-cross and only polls closely inside that
+        guard window. With the PIO gate, the task only tracks the mains timing and keeps the
+        state machine's phase delay current; the gate itself fires from the PIO.
+        """
+        self.zero_cross.reset()  # Count only edges seen from here on
         while True:
-            if self.zero_cross.count > previous_count:
+            if self.zero_cross.count:
                 # Zero-cross detected
+                self.zero_cross.reset()
                 current_time = time.monotonic()
 
-                # Calculate the time since the last zero-cross event
-                if self.last_zero_cross_time != 0:
-                    cycle_time = current_time - self.last_zero_cross_time
-                    self.ac_half_cycle_time = cycle_time / 2  # Update half-cycle time
+                # Debounced zero-crossing event (ignore edges closer than the debounce time)
+                if current_time - self.last_zero_cross_time >= self.debounce_time:
+                    # Calculate the time since the last zero-cross event
+                    if self.last_zero_cross_time != 0:
+                        cycle_time = current_time - self.last_zero_cross_time
+                        self.ac_half_cycle_time = cycle_time / 2  # Update half-cycle time
 
-                    # Adjust debounce time based on the cycle time (10% of the half-cycle)
-                    self.debounce_time = 0.1 * self.ac_half_cycle_time
+                        # Adjust debounce time based on the cycle time (10% of the half-cycle)
+                        self.debounce_time = 0.1 * self.ac_half_cycle_time
 
-                # Debounced zero-crossing event (ensure debounce time has passed)
-                if current_time - self.last_zero_cross_time >= self.debounce_time:
-                    previous_count = self.zero_cross.count
                     self.last_zero_cross_time = current_time  # Update last zero-cross time
 
-                    if self.state:
+                    if self.gate_sm is not None:
+                        self.update_gate()
+                    elif self.state:
                         # Dynamically adjust delay based on zero-cross timing and duty cycle
-                        phase_delay = (1 - self.duty_cycle / 100) * self.ac_half_cycle_time
-                        await asyncio.sleep(phase_delay)
+                        await asyncio.sleep(self.phase_delay())
 
                         # Briefly trigger the control pin to activate the heater (or TRIAC)
-                        self.control_pin.value = True
-                        await asyncio.sleep(0.0001)  # Brief pulse (approximate 100 µs)
-                        self.control_pin.value = False
+                        self.fire_pulse()
+
+                    # Discard any contact bounce counted since the edge
+                    self.zero_cross.reset()
 
-            # Allow other tasks to run
-            await asyncio.sleep(0)
+            # Sleep until just before the next expected edge, then poll closely
+            wait = (self.last_zero_cross_time + 2 * self.ac_half_cycle_time
+                    - EDGE_GUARD_TIME - time.monotonic())
+            await asyncio.sleep(wait if wait > 0 else 0)
+
+    def phase_delay(self):
+        """
+        Delay from the zero-cross to the gate pulse, in seconds, for the current duty cycle.
+        """
+        return (1 - self.duty_cycle / 100) * self.ac_half_cycle_time
+
+    def update_gate(self):
+        """
+        Start, stop, or reload the PIO gate to match the heater state, duty cycle and measured
+        half-cycle time. The delay is only written to the state machine when it changes.
+        """
+        sm = self.gate_sm
+        if not self.state or self.duty_cycle <= 0:
+            if self.delay_cycles >= 0:
+                sm.stop()
+                sm.run(SET_PINS_LOW)  # Never leave the gate high if stopped mid-pulse
+                self.delay_cycles = -1
+            return
+
+        delay_cycles = int(self.phase_delay() * GATE_FREQUENCY)
+        if delay_cycles != self.delay_cycles:
+            sm.write(array.array("L", (delay_cycles,)))
+            if self.delay_cycles < 0:
+                # Load the delay into X before starting, so the first `pull noblock` cannot fall
+                # back to a stale X (0, i.e. full conduction, on the first start)
+                sm.run(LOAD_DELAY)
+                sm.restart()
+            self.delay_cycles = delay_cycles
+
+    def fire_pulse(self):
+        """
+        Emits one 100µs gate pulse by busy-waiting, for boards without PIO, since an asyncio
+        sleep cannot time 100µs and would hold the TRIAC gate high for milliseconds.
+        """
+        pulse_start = time.monotonic_ns()
+        self.control_pin.value = True
+        while time.monotonic_ns() - pulse_start < PULSE_NS:
+            pass
+        self.control_pin.value = False
 
     def set_duty_cycle(self, duty_cycle):
         """
@@ -71,6 +181,8 @@ class AC_Heater:
         """
         if 0 <= duty_cycle <= 100:
             self.duty_cycle = duty_cycle
+            if self.gate_sm is not None:
+                self.update_gate()
         else:
             raise ValueError("Duty cycle must be between 0 and 100")
 
@@ -78,10 +190,14 @@ class AC_Heater:
         """Turn on the heater with a specified duty cycle."""
         self.set_duty_cycle(duty_cycle)
         self.state = True
+        if self.gate_sm is not None:
+            self.update_gate()
 
     def turn_off(self):
         """Turn off the heater."""
         self.state = False
+        if self.gate_sm is not None:
+            self.update_gate()
 
 # Example usage
 async def main():
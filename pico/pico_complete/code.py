@@ -71,6 +71,9 @@ async def control_loop():
     commands from the Raspberry Pi.
     """
 
+    # Bring up SD card logging once at boot; on failure the logger falls back to the console
+    Logger.initialize_sd_card()
+
 # Log the system start and warm-up period
     Logger.log_info("Starting system... warming up sensors for 15 seconds.")
     await asyncio.sleep(15)  # Delay for sensor warm-up (use asyncio.sleep for async compatibility)
@@ -81,7 +84,8 @@ async def control_loop():
     sensor_manager.initialize_sensors()  # Initialize sensors
 
     # Step 2: Initialize PID controller with default tuning values (will be auto-tuned)
-    pid_controller = PIDController(Kp=2.0, Ki=0.1, Kd=0.05, setpoint=default_temperature)
+    pid_controller = PIDController(Kp=2.0, Ki=0.1, Kd=0.05, setpoint=default_temperature,
+                                   dt_nominal=heater_temp_query_interval)
 
     # Step 3: Initialize the heater controller
     heater_controller = HeaterController(zero_cross_pin=zero_cross_pin, control_pin=heater_control_pin, pid_controller=pid_controller)
@@ -92,9 +96,7 @@ async def control_loop():
     tuned_Kp, tuned_Ki, tuned_Kd = auto_tuner.auto_tune()  # Perform auto-tuning for PID parameters
 
     # Step 5: Update the PID controller with the tuned values
-    pid_controller.Kp = tuned_Kp
-    pid_controller.Ki = tuned_Ki
-    pid_controller.Kd = tuned_Kd
+    pid_controller.set_gains(tuned_Kp, tuned_Ki, tuned_Kd, heater_temp_query_interval)
     Logger.log_info(f"Tuned PID parameters: Kp={tuned_Kp}, Ki={tuned_Ki}, Kd={tuned_Kd}")
 
     # Step 6: Set the initial sensor query interval (set from the global default)
@@ -117,7 +119,9 @@ async def control_loop():
     await asyncio.gather(
         heater_controller.zero_cross_task(),  # Zero crossing task for AC heater control
         maintain_temperature(heater_controller, sensor_manager),  # PID-based temperature maintenance
-        recalibrate_at_target_temp(sensor_manager)  # CO2 recalibration once the temperature stabilizes
+        recalibrate_at_target_temp(sensor_manager),  # CO2 recalibration once the temperature stabilizes
+        sensor_manager.sensor_data_flush_task(),  # Background flush of buffered sensor data
+        Logger.drain_task()  # Background write of queued log entries
     )
 
     # Main loop for sensor reading and command handling
@@ -146,7 +150,7 @@ async def control_loop():
                 command_handler.handle(command)  # Handle the command
 
                 # If the command is to update the cycle interval, it is handled here
-                if command.startswith("SET_CYCLE_MINS"):
+                if command[:14] == "SET_CYCLE_MINS":
                     new_cycle = int(command.split(",")[1]) * 60  # Convert minutes to seconds
                     sensor_query_interval = max(60, new_cycle)  # Ensure a minimum interval of 1 minute
                     Logger.log_info(f"Sensor query interval set to {sensor_query_interval} seconds.")
@@ -158,7 +162,11 @@ async def control_loop():
 
         # Step 12: Flush buffers before system resets or shutdowns
         if should_reset_or_shutdown():
-            Logger.flush_all_buffers()  # Ensure buffers are flushed before shutdown
+            try:
+                sensor_manager.write_sensor_data_to_sd()  # Hand any ring-buffered readings to the logger
+            except Exception as e:
+                Logger.log_traceback_error(e)
+            Logger.close()  # Ensure buffers are flushed and log files closed before shutdown
             if shutting_down:
                 sensor_manager.shutdown_pico()
             elif resetting:
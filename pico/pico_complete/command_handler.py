@@ -9,6 +9,10 @@ The CommandHandler manages:
 - Resetting or shutting down the system, ensuring all buffers are flushed before.
 - Handling all interactions needed to control the system.
 
+Commands are dispatched through a single module-level table of plain functions, each called
+as `fn(handler, arg)`. The table is shared by every CommandHandler instance, so no bound
+method objects are created or stored per instance.
+
 Dependencies:
 - HeaterController: For managing heater state and control.
 - SensorManager: For managing and interacting with sensors.
@@ -19,6 +23,178 @@ Dependencies:
 from logger import Logger
 import microcontroller
 
+# Command verbs, the keys of _DISPATCH. A received verb resolves to its handler with one dict
+# lookup instead of walking an if/elif chain of comparisons.
+_SET_HEATER_TEMP = "SET_HEATER_TEMP"
+_SET_HEATER_DUTY = "SET_HEATER_DUTY"
+_HEATER_ON = "HEATER_ON"
+_HEATER_OFF = "HEATER_OFF"
+_FEED = "FEED"
+_CALIBRATE = "CALIBRATE"
+_REQUEST_DATA = "REQUEST_DATA"
+_SYNC_TIME = "SYNC_TIME"
+_REQUEST_RTC_TIME = "REQUEST_RTC_TIME"
+_SET_ALTITUDE = "SET_ALTITUDE"
+_SET_PRESSURE = "SET_PRESSURE"
+_SET_CYCLE_MINS = "SET_CYCLE_MINS"
+_SET_CO2_INTERVAL = "SET_CO2_INTERVAL"
+_SHUTDOWN = "SHUTDOWN"
+_RESET_PICO = "RESET_PICO"
+
+# ---- Heater Control Commands ----
+
+def _set_heater_temp(self, arg):
+    """Handles "SET_HEATER_TEMP,<°C>" by updating the PID setpoint."""
+    temp = int(arg)
+    Logger.log_info(f"Setting heater target temperature to: {temp}°C")
+    self.heater_controller.pid_controller.setpoint = temp
+
+def _set_heater_duty(self, arg):
+    """Handles "SET_HEATER_DUTY,<%>" by updating the maximum heater duty cycle."""
+    duty_cycle = int(arg)
+    Logger.log_info(f"Setting max heater duty cycle to: {duty_cycle}%")
+    self.heater_controller.max_duty_cycle = duty_cycle
+
+def _heater_on(self, arg):
+    """Handles "HEATER_ON"."""
+    Logger.log_info("Turning heater ON.")
+    self.heater_controller.turn_on()
+
+def _heater_off(self, arg):
+    """Handles "HEATER_OFF"."""
+    Logger.log_info("Turning heater OFF.")
+    self.heater_controller.turn_off()
+
+# ---- Sensor-Related Commands ----
+
+def _feed(self, arg):
+    """Handles "FEED,<grams>" by logging the feed operation with current sensor data."""
+    try:
+        Logger.log_info(f"Feed command received: {arg} grams")
+        self.sensor_manager.send_sensor_data(arg, None)
+    except Exception as e:
+        Logger.log_traceback_error(e)
+
+def _calibrate(self, arg):
+    """Handles "CALIBRATE,<ppm>" by applying a forced SCD30 recalibration."""
+    try:
+        recalibration_value = int(arg)
+        self.sensor_manager.scd30.forced_recalibration_reference = recalibration_value
+        Logger.log_info(f"SCD30 CO2 recalibrated to: {recalibration_value} ppm")
+        self.sensor_manager.send_sensor_data(None, recalibration_value)
+    except Exception as e:
+        Logger.log_traceback_error(e)
+
+def _request_data(self, arg):
+    """Handles "REQUEST_DATA"."""
+    try:
+        Logger.log_info("Data request command received.")
+        self.sensor_manager.send_sensor_data()
+    except Exception as e:
+        Logger.log_traceback_error(e)
+
+# ---- RTC-Related Commands ----
+
+def _sync_time(self, arg):
+    """Handles "SYNC_TIME,YYYY-MM-DD HH:MM:SS"."""
+    try:
+        Logger.log_info("Time sync command received.")
+        self.sensor_manager.sync_rtc_time(arg)
+    except Exception as e:
+        Logger.log_traceback_error(e)
+
+def _request_rtc_time(self, arg):
+    """Handles "REQUEST_RTC_TIME" by printing the current RTC time."""
+    try:
+        Logger.log_info("RTC time request command received.")
+        timestamp = self.sensor_manager.get_rtc_time()
+        print(f"RTC time: {timestamp}")
+    except Exception as e:
+        Logger.log_traceback_error(e)
+
+# ---- Environmental Settings Commands ----
+
+def _set_altitude(self, arg):
+    """Handles "SET_ALTITUDE,<meters>"."""
+    try:
+        altitude = int(arg)
+        Logger.log_info(f"Set altitude command received: {altitude} meters")
+        self.sensor_manager.set_altitude(altitude)
+    except Exception as e:
+        Logger.log_traceback_error(e)
+
+def _set_pressure(self, arg):
+    """Handles "SET_PRESSURE,<hPa>"."""
+    try:
+        pressure = int(arg)
+        Logger.log_info(f"Set pressure command received: {pressure} hPa")
+        self.sensor_manager.set_pressure_reference(pressure)
+    except Exception as e:
+        Logger.log_traceback_error(e)
+
+# ---- System Cycle and CO2 Interval Commands ----
+
+def _set_cycle_mins(self, arg):
+    """Handles "SET_CYCLE_MINS,<minutes>"."""
+    new_cycle = int(arg)
+    Logger.log_info(f"Set cycle command received: {new_cycle} minute(s)")
+    self.sensor_manager.set_cycle(new_cycle)
+
+def _set_co2_interval(self, arg):
+    """Handles "SET_CO2_INTERVAL,<seconds>"."""
+    try:
+        interval = int(arg)
+        Logger.log_info(f"Set CO2 interval command received: {interval} second(s)")
+        self.sensor_manager.set_co2_interval(interval)
+    except Exception as e:
+        Logger.log_traceback_error(e)
+
+# ---- System Commands ----
+
+def _flush_sensor_ring(self):
+    """Moves readings still in the sensor ring into the logger so Logger.close() writes them."""
+    try:
+        self.sensor_manager.write_sensor_data_to_sd()
+    except Exception as e:
+        Logger.log_traceback_error(e)
+
+def _shutdown(self, arg):
+    """Handles "SHUTDOWN" after flushing all log buffers."""
+    Logger.log_info("Shutdown command received. Flushing buffers and shutting down.")
+    _flush_sensor_ring(self)
+    Logger.close()  # Ensure all logs are written and the log files closed
+    self.sensor_manager.shutdown_pico()
+
+def _reset_pico(self, arg):
+    """Handles "RESET_PICO" after flushing all log buffers."""
+    Logger.log_info("Reset command received. Flushing buffers and resetting.")
+    _flush_sensor_ring(self)
+    Logger.close()  # Ensure all logs are written and the log files closed
+    microcontroller.reset()
+
+# Command verb -> handler function, shared across all CommandHandler instances.
+# REQUEST_DATA, HEATER_ON and HEATER_OFF are the commands the Pi sends most often. Like every
+# other verb they resolve with one hash lookup; there is no prefix-matching fallback to scan.
+_DISPATCH = {
+    # Hot commands
+    _REQUEST_DATA: _request_data,
+    _HEATER_ON: _heater_on,
+    _HEATER_OFF: _heater_off,
+    # Setters and infrequent commands
+    _SET_HEATER_TEMP: _set_heater_temp,
+    _SET_HEATER_DUTY: _set_heater_duty,
+    _FEED: _feed,
+    _CALIBRATE: _calibrate,
+    _SYNC_TIME: _sync_time,
+    _REQUEST_RTC_TIME: _request_rtc_time,
+    _SET_ALTITUDE: _set_altitude,
+    _SET_PRESSURE: _set_pressure,
+    _SET_CYCLE_MINS: _set_cycle_mins,
+    _SET_CO2_INTERVAL: _set_co2_interval,
+    _SHUTDOWN: _shutdown,
+    _RESET_PICO: _reset_pico,
+}
+
 class CommandHandler:
     """
     CommandHandler processes incoming commands from the Raspberry Pi and interacts with
@@ -49,99 +225,23 @@ class CommandHandler:
         - RTC Commands: "SYNC_TIME,2024-09-13 14:30:00", "REQUEST_RTC_TIME"
         - System Commands: "SET_CYCLE_MINS,5", "SET_CO2_INTERVAL,10", "SHUTDOWN", "RESET_PICO"
         - Environmental Settings: "SET_ALTITUDE,150", "SET_PRESSURE,1020"
-        """
-        try:
-            # Log the received command for debugging and traceability
-            Logger.log_info(f"Received command: {command}")
-
-            # ---- Heater Control Commands ----
-
-            if command.startswith("SET_HEATER_TEMP"):
-                temp = int(command.split(",")[1])
-                Logger.log_info(f"Setting heater target temperature to: {temp}°C")
-                self.heater_controller.pid_controller.setpoint = temp
-
-            elif command.startswith("SET_HEATER_DUTY"):
-                duty_cycle = int(command.split(",")[1])
-                Logger.log_info(f"Setting max heater duty cycle to: {duty_cycle}%")
-                self.heater_controller.max_duty_cycle = duty_cycle
-
-            elif command == "HEATER_ON":
-                Logger.log_info("Turning heater ON.")
-                self.heater_controller.turn_on()
-
-            elif command == "HEATER_OFF":
-                Logger.log_info("Turning heater OFF.")
-                self.heater_controller.turn_off()
-
-            # ---- Sensor-Related Commands ----
-
-            elif command.startswith("FEED"):
-                feed_amount = command.split(",")[1]
-                Logger.log_info(f"Feed command received: {feed_amount} grams")
-                self.sensor_manager.send_sensor_data(feed_amount, None)
-
-            elif command.startswith("CALIBRATE"):
-                recalibration_value = int(command.split(",")[1])
-                self.sensor_manager.scd30.forced_recalibration_reference = recalibration_value
-                Logger.log_info(f"SCD30 CO2 recalibrated to: {recalibration_value} ppm")
-                self.sensor_manager.send_sensor_data(None, recalibration_value)
-
-            elif command == "REQUEST_DATA":
-                Logger.log_info("Data request command received.")
-                self.sensor_manager.send_sensor_data()
 
-            # ---- RTC-Related Commands ----
-
-            elif command.startswith("SYNC_TIME"):
-                Logger.log_info("Time sync command received.")
-                self.sensor_manager.sync_rtc_time(command)
-
-            elif command == "REQUEST_RTC_TIME":
-                Logger.log_info("RTC time request command received.")
-                timestamp = self.sensor_manager.get_rtc_time()
-                print(f"RTC time: {timestamp}")
-
-            # ---- Environmental Settings Commands ----
-
-            elif command.startswith("SET_ALTITUDE"):
-                altitude = int(command.split(",")[1])
-                Logger.log_info(f"Set altitude command received: {altitude} meters")
-                self.sensor_manager.set_altitude(altitude)
-
-            elif command.startswith("SET_PRESSURE"):
-                pressure = int(command.split(",")[1])
-                Logger.log_info(f"Set pressure command received: {pressure} hPa")
-                self.sensor_manager.set_pressure_reference(pressure)
-
-            # ---- System Cycle and CO2 Interval Commands ----
-
-            elif command.startswith("SET_CYCLE_MINS"):
-                new_cycle = int(command.split(",")[1])
-                Logger.log_info(f"Set cycle command received: {new_cycle} minute(s)")
-                self.sensor_manager.set_cycle(new_cycle)
-
-            elif command.startswith("SET_CO2_INTERVAL"):
-                interval = int(command.split(",")[1])
-                Logger.log_info(f"Set CO2 interval command received: {interval} second(s)")
-                self.sensor_manager.set_co2_interval(interval)
-
-            # ---- System Commands ----
-
-            elif command == "SHUTDOWN":
-                Logger.log_info("Shutdown command received. Flushing buffers and shutting down.")
-                Logger.flush_all_buffers()  # Ensure all logs are written
-                self.sensor_manager.shutdown_pico()
+        Raises:
+            ValueError: If a heater or cycle setter receives a non-numeric argument. Handlers that
+                perform sensor or RTC I/O log their own failures instead of raising.
+        """
+        # Log the received command for debugging and traceability
+        Logger.log_info(f"Received command: {command}")
 
-            elif command == "RESET_PICO":
-                Logger.log_info("Reset command received. Flushing buffers and resetting.")
-                Logger.flush_all_buffers()  # Ensure all logs are written
-                microcontroller.reset()
+        # Split "VERB,argument" once; exact-match commands carry an empty argument
+        verb, _, arg = command.partition(",")
+        fn = _DISPATCH.get(verb)
 
-            # ---- Invalid Command ----
+        # ---- Invalid Command ----
 
-            else:
-                Logger.log_error(f"Invalid command received: {command}")
+        if fn is None:
+            Logger.log_error(f"Invalid command received: {command}")
+            return
 
-        except Exception as e:
-            Logger.log_traceback_error(e)  # Log detailed error information if exceptions occur
+        # No exception frame on the dispatch path; handlers with sensor or RTC I/O guard themselves
+        fn(self, arg)
@@ -3,18 +3,82 @@ HeaterController manages the control of an AC heater using PID control and zero-
 The controller ensures that the duty cycle does not exceed a defined maximum and uses phase-delay
 switching to control the heater's power.
 
+On the RP2040 the edge-to-gate sequence runs in a PIO state machine: it waits for the zero-cross
+edge, counts down the phase delay loaded from its TX FIFO, and raises the control pin for 100µs.
+Python only recomputes the delay when the duty cycle or mains timing changes, so the gate timing
+is free of asyncio scheduler jitter. Ports without `rp2pio` fall back to a polling task.
+
 Dependencies:
 - digitalio: For controlling the heater's GPIO pin.
 - countio: For counting zero-cross events in the AC signal.
+- rp2pio: For hardware-timed phase-delay gating (optional).
 - asyncio: For managing asynchronous tasks.
+- micropython: For compile-time integer constants.
 - Logger: For logging important events and errors.
 """
 
+import time
+import array
 import digitalio
 import countio
 import asyncio
+from micropython import const
 from logger import Logger
 
+try:
+    import rp2pio
+except ImportError:
+    rp2pio = None
+
+# PIO clock; one state machine cycle is 1µs, so delay counts are in microseconds
+_PIO_FREQUENCY = const(1_000_000)
+
+# Gate pulse width for the polling fallback
+_PULSE_NS = const(100_000)
+
+# Default half-cycle time for 50Hz AC (10ms), used until the mains period is measured
+_DEFAULT_HALF_CYCLE_S = 0.01
+
+# Hand-assembled PIO program. The zero-cross GPIO number is OR'd into the two WAIT instructions
+# so the pin can stay claimed by countio for mains-period measurement.
+#   0: pull noblock      ; take a new delay from the TX FIFO, or keep the last one (X)
+#   1: mov x, osr
+#   2: wait 0 gpio <zc>
+#   3: wait 1 gpio <zc>  ; rising zero-cross edge
+#   4: mov y, x
+#   5: jmp y-- 5         ; phase delay, 1µs per iteration
+#   6: set pins, 1 [31]  ; gate pulse: 32 + 32 + 32 + 4 = 100 cycles high
+#   7: nop [31]
+#   8: nop [31]
+#   9: nop [3]
+#  10: set pins, 0
+_ZC_GATE_PROGRAM = (0x8080, 0xA027, 0x2000, 0x2080, 0xA041, 0x0085,
+                    0xFF01, 0xBF42, 0xBF42, 0xA342, 0xE000)
+_SET_PINS_LOW = array.array("H", (0xE000,))
+
+# Executed on the stopped state machine to load the newest FIFO word into X: the TX FIFO holds at
+# most four words, and `pull noblock` on an empty FIFO copies X, so five pairs always end with X
+# holding the word written last.
+_LOAD_DELAY = array.array("H", (0x8080, 0xA027) * 5)
+
+# How often the mains period is re-estimated from the zero-cross counter
+_PERIOD_SAMPLE_S = 0.5
+
+# Polling fallback: start watching for the next zero-cross edge this long before it is due
+_EDGE_GUARD_S = 0.002
+
+# Minimum spacing between repeated error logs from the timing tasks
+_ERROR_LOG_INTERVAL_NS = const(1_000_000_000)
+
+# Consecutive polling-task failures after which it backs off for a second between retries
+_MAX_ERROR_STREAK = const(100)
+
+def _gpio_number(pin):
+    """
+    Returns the RP2040 GPIO number for a board pin (e.g., board.GP14 -> 14).
+    """
+    return int(str(pin).rsplit("GP", 1)[1])
+
 class HeaterController:
     def __init__(self, zero_cross_pin, control_pin, pid_controller, max_duty_cycle=30):
         """
@@ -26,57 +90,193 @@ class HeaterController:
             pid_controller (PIDController): An instance of PIDController to manage temperature control.
             max_duty_cycle (int): The maximum allowable duty cycle (0-100%). Defaults to 40%.
         """
-        self.control_pin = digitalio.DigitalInOut(control_pin)
-        self.control_pin.direction = digitalio.Direction.OUTPUT
-        self.control_pin.value = False  # Ensure heater is off initially
-
         self.zero_cross = countio.Counter(zero_cross_pin, edge=countio.Edge.RISE)
-        self.ac_half_cycle_time = 0.01  # Default half-cycle time for 50Hz AC (10ms)
+        self.ac_half_cycle_time = _DEFAULT_HALF_CYCLE_S
         self.duty_cycle = 0
+        self._duty_frac = 0.0  # duty_cycle as a fraction (0.0-1.0)
         self.max_duty_cycle = max_duty_cycle
         self.state = False  # Heater's operational state (True if ON, False if OFF)
         self.pid_controller = pid_controller
-        self.last_zero_cross_time = 0
+        self.last_zero_cross_time = 0  # time.monotonic_ns() of the last zero-cross edge
+        self._phase_delay_s = self.ac_half_cycle_time  # Cached (1 - duty) * half-cycle, in seconds
+        self._last_err_ns = None  # When a recurring task error was last logged
+        self._err_streak = 0  # Consecutive failed iterations of the polling task
+        self._enabled = asyncio.Event()  # Set while the heater is ON with a non-zero duty cycle
+
+        self._gate_sm = None
+        self._delay_cycles = -1  # Phase delay last pushed to the PIO state machine
+        if rp2pio is not None:
+            zc = _gpio_number(zero_cross_pin)
+            program = array.array("H", _ZC_GATE_PROGRAM)
+            program[2] |= zc
+            program[3] |= zc
+            self._gate_sm = rp2pio.StateMachine(
+                program,
+                frequency=_PIO_FREQUENCY,
+                first_set_pin=control_pin,
+                initial_set_pin_state=0,
+                initial_set_pin_direction=1,
+            )
+            self._gate_sm.stop()  # Heater starts OFF; the state machine runs only while gating
+            self.control_pin = None
+        else:
+            self.control_pin = digitalio.DigitalInOut(control_pin)
+            self.control_pin.direction = digitalio.Direction.OUTPUT
+            self.control_pin.value = False  # Ensure heater is off initially
 
     async def zero_cross_task(self):
         """
         Asynchronous task to handle zero-cross detection and phase-delay switching.
 
-        The task continuously monitors zero-cross events and adjusts the heater's power based on
-        the duty cycle calculated by the PID controller.
+        With the PIO gate, this task only tracks mains timing and keeps the state machine's phase
+        delay current. Otherwise it monitors zero-cross events and pulses the heater directly.
+        Errors are logged and the task keeps running; it never exits on a fault.
         """
-        previous_count = self.zero_cross.count  # Store the initial zero-cross count
+        if self._gate_sm is not None:
+            await self._pio_timing_task()
+            return
+
+        # Local names avoid repeated attribute lookups on the per-edge path
+        zero_cross = self.zero_cross
+        control_pin = self.control_pin
+        zero_cross.reset()  # Count only edges seen from here on
         while True:
             try:
-                if self.zero_cross.count > previous_count:
-                    current_time = time.monotonic()
+                if not self._enabled.is_set():
+                    # Heater OFF or 0% duty: nothing to gate, so idle until re-enabled and then
+                    # restart edge timing rather than measure across the idle gap
+                    await self._enabled.wait()
+                    zero_cross.reset()
+                    self.last_zero_cross_time = 0
+
+                # Read and clear the counter; any number of edges since the last poll is one event
+                edges = zero_cross.count
+                if edges:
+                    zero_cross.reset()
+                    current_time = time.monotonic_ns()
                     if self.last_zero_cross_time != 0:
-                        cycle_time = current_time - self.last_zero_cross_time
-                        self.ac_half_cycle_time = cycle_time / 2
+                        cycle_time_ns = current_time - self.last_zero_cross_time
+                        self.ac_half_cycle_time = cycle_time_ns * 0.5e-9 / edges
+                        self._update_phase_delay()
 
-                    previous_count = self.zero_cross.count
                     self.last_zero_cross_time = current_time
 
                     if self.state:  # Heater is ON
-                        phase_delay = (1 - self.duty_cycle / 100) * self.ac_half_cycle_time
-                        await asyncio.sleep(phase_delay)
-                        self.control_pin.value = True
-                        await asyncio.sleep(0.0001)  # 100µs pulse for phase-delay control
-                        self.control_pin.value = False
+                        await asyncio.sleep(self._phase_delay_s)
+
+                        # 100µs gate pulse. Busy-wait rather than yield: asyncio cannot time a
+                        # 100µs sleep and would hold the triac on for whole milliseconds. The spin
+                        # is bounded to 100µs per half-cycle (<1% CPU at 100Hz).
+                        pulse_start = time.monotonic_ns()
+                        control_pin.value = True
+                        while time.monotonic_ns() - pulse_start < _PULSE_NS:
+                            pass
+                        control_pin.value = False
 
-                await asyncio.sleep(0)
+                # countio offers no edge callback to set an asyncio.Event from, so instead of
+                # spinning with sleep(0), sleep until just before the next expected edge and
+                # only poll closely inside that guard window.
+                wait = ((self.last_zero_cross_time - time.monotonic_ns()) * 1e-9
+                        + 2 * self.ac_half_cycle_time - _EDGE_GUARD_S)
+                await asyncio.sleep(wait if wait > 0 else 0)
+                self._err_streak = 0
             except Exception as e:
-                Logger.log_traceback_error(e)
-                raise RuntimeError("Critical failure in zero-cross task. Halting system.") from e
+                # Keep phase control alive through transient faults; back off if one persists
+                self._log_task_error(e)
+                self._err_streak += 1
+                await asyncio.sleep(1 if self._err_streak > _MAX_ERROR_STREAK else 0)
+
+    async def _pio_timing_task(self):
+        """
+        Estimates the mains half-cycle time from the zero-cross counter and pushes the resulting
+        phase delay to the PIO state machine whenever it changes.
+        """
+        previous_count = self.zero_cross.count
+        previous_time = time.monotonic_ns()
+        while True:
+            await self._enabled.wait()  # No timing updates needed while the gate is idle
+            await asyncio.sleep(_PERIOD_SAMPLE_S)
+            try:
+                count = self.zero_cross.count
+                now = time.monotonic_ns()
+                edges = count - previous_count
+                if edges > 0:
+                    self.ac_half_cycle_time = (now - previous_time) * 0.5e-9 / edges
+                    self._update_phase_delay()
+                previous_count = count
+                previous_time = now
+                self._update_gate()
+            except Exception as e:
+                self._log_task_error(e)
+
+    def _log_task_error(self, e):
+        """
+        Logs a recurring task error at most once per second, as a one-line repr rather than a full
+        traceback. Formatting a traceback walks the frames and allocates a large string, which is
+        too costly to do from a timing task.
+        """
+        now = time.monotonic_ns()
+        if self._last_err_ns is not None and now - self._last_err_ns < _ERROR_LOG_INTERVAL_NS:
+            return
+        self._last_err_ns = now
+        Logger.log_error("zc: " + repr(e))
+
+    def _update_gate(self):
+        """
+        Starts, stops, or reloads the PIO gate to match the heater state and duty cycle.
+        """
+        sm = self._gate_sm
+        if sm is None:
+            return
+
+        if not self.state or self.duty_cycle <= 0:
+            if self._delay_cycles >= 0:
+                sm.stop()
+                sm.run(_SET_PINS_LOW)  # Never leave the gate high if stopped mid-pulse
+                self._delay_cycles = -1
+            return
+
+        delay_cycles = int(self._phase_delay_s * _PIO_FREQUENCY)
+        if delay_cycles != self._delay_cycles:
+            sm.write(array.array("L", (delay_cycles,)))
+            if self._delay_cycles < 0:
+                # Load the delay into X before starting, so the first `pull noblock` cannot fall
+                # back to a stale X (0 on first enable, i.e. full conduction)
+                sm.run(_LOAD_DELAY)
+                sm.restart()
+            self._delay_cycles = delay_cycles
+
+    def _update_enabled(self):
+        """
+        Wakes the timing task when the heater needs gating and idles it otherwise.
+        """
+        if self.state and self.duty_cycle > 0:
+            self._enabled.set()
+        else:
+            self._enabled.clear()
+
+    def _update_phase_delay(self):
+        """
+        Recomputes the cached phase delay after the duty cycle or the half-cycle time changes.
+        """
+        self._phase_delay_s = (1.0 - self._duty_frac) * self.ac_half_cycle_time
 
     def set_duty_cycle(self, duty_cycle):
         """
         Sets the duty cycle for the heater, ensuring it doesn't exceed the maximum allowed duty cycle.
+        Does nothing if the capped duty cycle is unchanged.
 
         Args:
             duty_cycle (int): The desired duty cycle (0-100%).
         """
-        self.duty_cycle = min(duty_cycle, self.max_duty_cycle)
+        duty_cycle = min(duty_cycle, self.max_duty_cycle)
+        if duty_cycle == self.duty_cycle:
+            return
+        self.duty_cycle = duty_cycle
+        self._duty_frac = self.duty_cycle * 0.01
+        self._update_phase_delay()
+        self._update_enabled()
+        self._update_gate()
         Logger.log_info(f"Duty cycle set to: {self.duty_cycle}% (capped at {self.max_duty_cycle}%)")
 
     def turn_on(self):
@@ -84,6 +284,8 @@ class HeaterController:
         Turns the heater ON and logs the event.
         """
         self.state = True
+        self._update_enabled()
+        self._update_gate()
         Logger.log_info("Heater turned ON.")
 
     def turn_off(self):
@@ -91,4 +293,6 @@ class HeaterController:
         Turns the heater OFF and logs the event.
         """
         self.state = False
+        self._update_enabled()
+        self._update_gate()
         Logger.log_info("Heater turned OFF.")
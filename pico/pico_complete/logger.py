@@ -1,152 +1,560 @@
 """
-CommandHandler class for processing incoming commands from the Raspberry Pi.
+Logger module for logging system messages, errors, and tracebacks to the SD card.
 
-The CommandHandler manages:
-- Heater control (turning it on/off, setting temperature, and controlling duty cycle).
-- Sensor recalibration (CO2 sensor calibration, logging sensor data).
-- Setting system parameters (sensor data query interval, CO2 interval, etc.).
-- Synchronizing the real-time clock (RTC) with a provided timestamp.
-- Resetting or shutting down the system.
+This version implements buffered logging to reduce SD card write frequency. The log_* methods
+only encode their entry into a pre-allocated bytearray; `drain_task` writes each buffer to the
+SD card in one contiguous write once it is half full or periodically (every 1 minute), and it can
+also be flushed manually. If the drain task falls behind and a buffer fills, new entries are
+dropped rather than written from the caller. The log and sensor data files
+are kept open, so a flush does not pay for reopening them, and are only committed to the card by
+`flush_all_buffers` (every minute) or `close` (before a shutdown or reset). Both files are rotated
+to a single `.1` generation once they exceed MAX_LOG_BYTES.
 
 Dependencies:
-- HeaterController: For managing heater state and control.
-- SensorManager: For managing and interacting with sensors.
-- Logger: For logging system events and command handling.
-- microcontroller: To reset the system programmatically.
+- busio: For SPI communication.
+- digitalio: For controlling the SD card chip select (CS) pin.
+- storage: For mounting the SD card.
+- adafruit_sdcard: For interfacing with the SD card.
+- sys: For batched console output.
+- os: For rotating log files that have grown past their size cap.
+- traceback: For detailed error reporting.
+- asyncio: For the background drain task.
 """
 
-from logger import Logger
-import microcontroller
-
-class CommandHandler:
+import os
+import sys
+import traceback
+import time
+import asyncio
+import board
+import busio
+import storage
+import digitalio
+import adafruit_sdcard
+
+# Log entry templates, each applied with a single % operation
+_INFO_FMT = "%s INFO: %s\n"
+_ERROR_FMT = "%s ERROR: %s\n"
+_TRACEBACK_FMT = "%s TRACEBACK ERROR: %s\n"
+_SENSOR_FMT = "%s,%.2f,%.2f,%.1f\n"  # DS18B20 steps are 0.0625-0.5°C; duty cycle is 0-100%
+_BATCH_FMT = "%s,%.2f,%.2f,%.2f,%.2f,%.2f\n"  # CO2, temperature, humidity, DS18B20, pressure
+_SENSOR_CONSOLE_FMT = "%s Sensor Data: Temp=%.2fC, Setpoint=%.2fC, Duty=%.1f%%\n"
+
+# Zero-padded seconds field of a timestamp, indexed by second
+_TWO_DIGIT = tuple("%02d" % i for i in range(60))
+
+def _civil_from_days(days):
     """
-    CommandHandler processes incoming commands from the Raspberry Pi and interacts with
-    the HeaterController and SensorManager to perform various system actions.
+    Converts a count of days since 1970-01-01 to a Gregorian (year, month, day) tuple using integer
+    arithmetic only (Howard Hinnant's civil_from_days).
     """
+    days += 719468
+    era = days // 146097
+    doe = days - era * 146097  # Day of the 400-year era [0, 146096]
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365  # Year of era [0, 399]
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)  # Day of year, counted from March 1st
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 if mp < 10 else mp - 9
+    year = yoe + era * 400 + (1 if month <= 2 else 0)
+    return year, month, day
+
+class Logger:
+    # Log file paths for general log messages and sensor data
+    LOG_FILE = "/sd/pico_log.txt"
+    DATA_LOG_FILE = "/sd/sensor_data.csv"
+
+    # Previous generation of each file, kept when it is rotated out
+    LOG_FILE_ROTATED = "/sd/pico_log.1.txt"
+    DATA_LOG_FILE_ROTATED = "/sd/sensor_data.1.csv"
+
+    # Size at which a log file is rotated, bounding its FAT chain and append latency
+    MAX_LOG_BYTES = 256 * 1024
+
+    # Track if the SD card has been initialized and mounted
+    sd_initialized = False
+
+    # SPI bus, chip select, card driver and filesystem, kept across initialization attempts
+    _spi = None
+    _cs = None
+    _sdcard = None
+    _vfs = None
+
+    # Pre-allocated byte buffers for entries awaiting the SD card, and how much of each is filled
+    LOG_BUFFER_SIZE = 8192
+    DATA_BUFFER_SIZE = 8192
+    _log_buf = bytearray(LOG_BUFFER_SIZE)
+    _log_len = 0
+    _data_buf = bytearray(DATA_BUFFER_SIZE)
+    _data_len = 0
+
+    # Threshold flushes end each file on a multiple of this many bytes (the FAT cluster size, capped
+    # at a 4 KiB flash page) so the card is not made to read-modify-write a partial unit
+    _write_align = 512
+
+    # Informational logging level: "INFO" to log, "NONE" to silence log_info
+    LEVEL = "INFO"
+
+    # Last message passed to log_info, used to suppress consecutive duplicates
+    _last_msg = ""
+
+    # Lowest level printed to the console as it is logged: "INFO" prints everything, "ERROR" batches
+    # info and sensor lines and writes them to the console when the log buffer is flushed
+    CONSOLE_LEVEL = "ERROR"
+    _console_buffer = []
+
+    # Recently formatted tracebacks keyed by exception id, oldest evicted first
+    TB_CACHE_SIZE = 4
+    _tb_cache = {}
+    _tb_cache_order = []
+
+    # Hard cap on batched console lines; the oldest are dropped beyond this
+    BUFFER_MAX = 256
+
+    # File handles, opened once the SD card is mounted, and the size of the file behind each
+    _log_fh = None
+    _log_bytes = 0
+    _data_fh = None
+    _data_bytes = 0
+
+    # Last flush timestamp for periodic flushing (every 1 minute)
+    last_flush_time = time.monotonic()
+
+    # Timestamp caches for get_rtc_time (epoch second / day / minute and their formatted strings)
+    _rtc_cache_s = -1
+    _rtc_cache_str = ""
+    _date_cache_day = -1
+    _date_cache_str = ""
+    _minute_cache_key = -1
+    _minute_cache_prefix = ""
+
+    @staticmethod
+    def initialize_sd_card():
+        """
+        Initializes the SD card for logging if it is not already initialized.
+        This method sets up SPI communication and mounts the SD card to the filesystem.
 
-    def __init__(self, heater_controller, sensor_manager):
+        Called once at boot. If it fails, logging continues on the console only; the log methods
+        never retry the SD card bring-up themselves. A later call retries, reusing the SPI bus, chip
+        select, card and filesystem objects that were already created.
         """
-        Initializes the CommandHandler with access to the heater controller and sensor manager.
+        if not Logger.sd_initialized:
+            try:
+                # SPI communication setup for the SD card; a second busio.SPI on the same pins
+                # would fail, so objects from an earlier attempt are kept and reused
+                if Logger._spi is None:
+                    Logger._spi = busio.SPI(clock=board.GP10, MOSI=board.GP11, MISO=board.GP12)
+                if Logger._cs is None:
+                    Logger._cs = digitalio.DigitalInOut(board.GP13)  # Chip select pin for the SD card
+                if Logger._sdcard is None:
+                    Logger._sdcard = adafruit_sdcard.SDCard(Logger._spi, Logger._cs)
+
+                # Mount the SD card to the filesystem
+                if Logger._vfs is None:
+                    Logger._vfs = storage.VfsFat(Logger._sdcard)
+                try:
+                    storage.mount(Logger._vfs, "/sd")
+                except OSError:
+                    # Still mounted from an attempt that failed later on; remount the same filesystem
+                    storage.umount("/sd")
+                    storage.mount(Logger._vfs, "/sd")
+
+                # Keep both files open; flushes write to these handles without reopening
+                Logger._log_fh = open(Logger.LOG_FILE, 'ab')
+                Logger._log_bytes = os.stat(Logger.LOG_FILE)[6]
+                Logger._data_fh = open(Logger.DATA_LOG_FILE, 'ab')
+                Logger._data_bytes = os.stat(Logger.DATA_LOG_FILE)[6]
+                Logger._write_align = min(os.statvfs("/sd")[0], 4096)
+
+                # Mark SD card as initialized
+                Logger.sd_initialized = True
+                Logger._tb_cache.clear()
+                Logger._tb_cache_order.clear()
+                Logger.log_info("SD card initialized and mounted successfully.")
+            except Exception as e:
+                # Handle any errors during SD card initialization
+                print(f"Failed to initialize SD card: {e}")
+                Logger.sd_initialized = False
+
+    @staticmethod
+    def get_rtc_time():
+        """
+        Gets the current timestamp from the system's RTC.
+        This method is useful for adding timestamps to logs.
 
-        Args:
-            heater_controller: Instance of HeaterController to manage the heater's state and temperature control.
-            sensor_manager: Instance of SensorManager to manage and retrieve sensor data.
+        The formatted string is cached for the current wall-clock second, so bursts of log calls
+        within the same second reuse it instead of converting and formatting the clock again.
+
+        Returns:
+            str: The current timestamp in the format "YYYY-MM-DD HH:MM:SS".
+        """
+        now_s = int(time.time())
+        if now_s == Logger._rtc_cache_s:
+            return Logger._rtc_cache_str
+
+        # "YYYY-MM-DD HH:MM:" only changes once a minute and the date once a day; CircuitPython
+        # keeps no timezone, so both follow from integer arithmetic on the epoch second
+        minute, secs = divmod(now_s, 60)
+        if minute != Logger._minute_cache_key:
+            day, minute_of_day = divmod(minute, 1440)
+            if day != Logger._date_cache_day:
+                Logger._date_cache_str = "%04d-%02d-%02d " % _civil_from_days(day)
+                Logger._date_cache_day = day
+            Logger._minute_cache_prefix = Logger._date_cache_str + "%02d:%02d:" % divmod(minute_of_day, 60)
+            Logger._minute_cache_key = minute
+
+        Logger._rtc_cache_str = Logger._minute_cache_prefix + _TWO_DIGIT[secs]
+        Logger._rtc_cache_s = now_s
+        return Logger._rtc_cache_str
+
+    @staticmethod
+    def log_info(message, *args):
         """
-        self.heater_controller = heater_controller
-        self.sensor_manager = sensor_manager
+        Logs informational messages to the buffer, which `drain_task` writes to the SD card.
+        Skipped when LEVEL is "NONE", and an identical message repeated back-to-back is only
+        logged once. With `args`, the message is a %-format string that is only interpolated
+        when the message will be logged, so callers can pass values instead of building
+        f-strings.
 
-    def handle(self, command):
+        Args:
+            message (str): The message to be logged, or a %-format string.
+            *args: Values for the %-format string.
+        """
+        # Drop disabled messages before any formatting, and repeated ones before timestamping
+        if Logger.LEVEL == "NONE":
+            return
+        if args:
+            message = message % args
+        if message == Logger._last_msg:
+            return
+        Logger._last_msg = message
+
+        # Info lines reach the console in batches unless CONSOLE_LEVEL is "INFO"
+        Logger._log(_INFO_FMT, message, Logger.CONSOLE_LEVEL == "INFO")
+
+    @staticmethod
+    def log_error(message):
         """
-        Processes the received command and executes the corresponding system action.
+        Logs error messages to the buffer, which `drain_task` writes to the SD card.
 
         Args:
-            command (str): The command string received from the Raspberry Pi.
+            message (str): The error message to be logged.
+        """
+        Logger._log(_ERROR_FMT, message, True)
 
-        Commands:
-        - Heater Control: "SET_HEATER_TEMP,45", "SET_HEATER_DUTY,30", "HEATER_ON", "HEATER_OFF"
-        - Sensor Management: "FEED,500", "CALIBRATE,400", "REQUEST_DATA"
-        - RTC Commands: "SYNC_TIME,2024-09-13 14:30:00", "REQUEST_RTC_TIME"
-        - System Commands: "SET_CYCLE_MINS,5", "SET_CO2_INTERVAL,10", "SHUTDOWN", "RESET_PICO"
-        - Environmental Settings: "SET_ALTITUDE,150", "SET_PRESSURE,1020"
+    @staticmethod
+    def log_traceback_error(e):
         """
-        try:
-            # Log the received command for debugging and traceability
-            Logger.log_info(f"Received command: {command}")
+        Logs detailed error messages with traceback information to help debug exceptions.
+        Adds traceback logs to the buffer, which `drain_task` writes to the SD card. An exception
+        logged again by an outer handler reuses its already formatted traceback.
 
-            # ---- Heater Control Commands ----
+        Args:
+            e (Exception): The exception object to log.
+        """
+        # Capture the full traceback as a string, reusing it if this exception was logged recently
+        cached = Logger._tb_cache.get(id(e))
+        if cached is not None and cached[0] is e:
+            tb_str = cached[1]
+        else:
+            tb_str = ''.join(traceback.format_exception(None, e, e.__traceback__))
+            if len(Logger._tb_cache_order) >= Logger.TB_CACHE_SIZE:
+                Logger._tb_cache.pop(Logger._tb_cache_order.pop(0), None)
+            # The exception is kept alongside its string so its id cannot be reused while cached
+            Logger._tb_cache[id(e)] = (e, tb_str)
+            Logger._tb_cache_order.append(id(e))
+        Logger._log(_TRACEBACK_FMT, tb_str, True)
+
+    @staticmethod
+    def log_sensor_data(temperature, setpoint, duty_cycle):
+        """
+        Logs sensor data (temperature, setpoint, and duty cycle) to the buffer for periodic flushing to the SD card
+        by `drain_task`.
 
-            if command.startswith("SET_HEATER_TEMP"):
-                temp = int(command.split(",")[1])
-                Logger.log_info(f"Setting heater target temperature to: {temp}°C")
-                self.heater_controller.pid_controller.setpoint = temp
+        Args:
+            temperature (float): The current temperature reading.
+            setpoint (float): The desired setpoint temperature.
+            duty_cycle (float): The current heater duty cycle.
+        """
+        # Get the current timestamp for the log entry
+        timestamp = Logger.get_rtc_time()
+        sensor_entry = _SENSOR_FMT % (timestamp, temperature, setpoint, duty_cycle)
 
-            elif command.startswith("SET_HEATER_DUTY"):
-                duty_cycle = int(command.split(",")[1])
-                Logger.log_info(f"Setting max heater duty cycle to: {duty_cycle}%")
-                self.heater_controller.max_duty_cycle = duty_cycle
+        # Queue for the drain task; without an SD card the entry only goes to the console
+        if Logger._data_fh is not None:
+            Logger._data_len = Logger._append(Logger._data_buf, Logger._data_len, sensor_entry)
 
-            elif command == "HEATER_ON":
-                Logger.log_info("Turning heater ON.")
-                self.heater_controller.turn_on()
+        Logger._echo(_SENSOR_CONSOLE_FMT % (timestamp, temperature, setpoint, duty_cycle),
+                     Logger.CONSOLE_LEVEL == "INFO")
 
-            elif command == "HEATER_OFF":
-                Logger.log_info("Turning heater OFF.")
-                self.heater_controller.turn_off()
+    @staticmethod
+    def log_sensor_data_batch(count, co2, temperature, humidity, ds_temp, pressure, start=0):
+        """
+        Queues a batch of buffered sensor readings for the SD card in a single pass.
 
-            # ---- Sensor-Related Commands ----
+        The readings are passed as parallel arrays (one per quantity) and `count` entries,
+        beginning at index `start` and wrapping around the end of the arrays, are formatted into the
+        sensor data buffer behind any entries already queued. The buffer is only written here if it
+        fills; otherwise the rows are left for `drain_task` or `close`.
 
-            elif command.startswith("FEED"):
-                feed_amount = command.split(",")[1]
-                Logger.log_info(f"Feed command received: {feed_amount} grams")
-                # Log the feed operation and current sensor data
-                self.sensor_manager.send_sensor_data(feed_amount, None)
+        Args:
+            count (int): Number of valid entries in each array.
+            co2 (array): CO2 readings (ppm).
+            temperature (array): SCD30 temperature readings (°C).
+            humidity (array): Relative humidity readings (%).
+            ds_temp (array): DS18B20 temperature readings (°C).
+            pressure (array): Pressure readings (hPa).
+            start (int): Index of the oldest entry when the arrays are used as a ring buffer.
+        """
+        if not count or Logger._data_fh is None:
+            return
+
+        timestamp = Logger.get_rtc_time()
+        buf = Logger._data_buf
+        size = len(buf)
+        slots = len(co2)
+        for k in range(count):
+            i = (start + k) % slots
+            row = (_BATCH_FMT % (
+                timestamp, co2[i], temperature[i], humidity[i], ds_temp[i], pressure[i])).encode()
+            end = Logger._data_len + len(row)
+            if end > size:
+                Logger.flush_sensor_data_buffer(aligned=True)
+                end = Logger._data_len + len(row)
+                if end > size:
+                    return  # The write failed and the buffer is still full; the flush printed why
+            buf[Logger._data_len:end] = row
+            Logger._data_len = end
+
+    @staticmethod
+    def flush_log_buffer(aligned=False):
+        """
+        Flushes the log buffer by writing all buffered log messages to the SD card. Batched console
+        lines are written out first, in a single write.
 
-            elif command.startswith("CALIBRATE"):
-                recalibration_value = int(command.split(",")[1])
-                self.sensor_manager.scd30.forced_recalibration_reference = recalibration_value
-                Logger.log_info(f"SCD30 CO2 recalibrated to: {recalibration_value} ppm")
-                # Log the recalibration action along with sensor data
-                self.sensor_manager.send_sensor_data(None, recalibration_value)
+        Args:
+            aligned (bool): Only write the part of the buffer that ends the file on an allocation
+                unit boundary and keep the remainder buffered.
+        """
+        if Logger._console_buffer:
+            sys.stdout.write("".join(Logger._console_buffer))
+            Logger._console_buffer.clear()
+
+        length = Logger._log_len
+        if not length or Logger._log_fh is None:
+            return
+        if Logger._log_bytes + length >= Logger.MAX_LOG_BYTES:
+            aligned = False  # The file rotates after this write; end it on a whole entry
+        try:
+            # One contiguous write on the already-open handle
+            written = Logger._write_buffer(Logger._log_fh, Logger._log_buf, length, Logger._log_bytes, aligned)
+            Logger._log_len = length - written
+
+            Logger._log_bytes += written
+            if Logger._log_bytes >= Logger.MAX_LOG_BYTES:
+                fh = Logger._log_fh
+                Logger._log_fh = None
+                Logger._log_fh = Logger._rotate(fh, Logger.LOG_FILE, Logger.LOG_FILE_ROTATED, 'ab')
+                Logger._log_bytes = os.stat(Logger.LOG_FILE)[6]
+        except Exception as e:
+            print(f"Failed to flush log buffer: {e}")
 
-            elif command == "REQUEST_DATA":
-                Logger.log_info("Data request command received.")
-                # Log the current sensor data immediately
-                self.sensor_manager.send_sensor_data()
+    @staticmethod
+    def flush_sensor_data_buffer(aligned=False):
+        """
+        Flushes the sensor data buffer by writing all buffered sensor data to the SD card.
 
-            # ---- RTC-Related Commands ----
+        Args:
+            aligned (bool): Only write the part of the buffer that ends the file on an allocation
+                unit boundary and keep the remainder buffered.
+        """
+        length = Logger._data_len
+        if not length or Logger._data_fh is None:
+            return
+        if Logger._data_bytes + length >= Logger.MAX_LOG_BYTES:
+            aligned = False  # The file rotates after this write; end it on a whole row
+        try:
+            # One contiguous write of the filled part of the buffer
+            written = Logger._write_buffer(Logger._data_fh, Logger._data_buf, length, Logger._data_bytes, aligned)
+            Logger._data_len = length - written
+            Logger._data_written(written)
+        except Exception as e:
+            print(f"Failed to flush sensor data buffer: {e}")
 
-            elif command.startswith("SYNC_TIME"):
-                Logger.log_info("Time sync command received.")
-                # Synchronize the RTC with the provided timestamp
-                self.sensor_manager.sync_rtc_time(command)
+    @staticmethod
+    def flush_all_buffers():
+        """
+        Flushes both log and sensor data buffers to the SD card and commits the open files.
+        """
+        Logger.flush_log_buffer()
+        Logger.flush_sensor_data_buffer()
+        Logger.flush()
 
-            elif command == "REQUEST_RTC_TIME":
-                Logger.log_info("RTC time request command received.")
-                # Retrieve and print the current RTC time
-                timestamp = self.sensor_manager.get_rtc_time()
-                print(f"RTC time: {timestamp}")
+    @staticmethod
+    def flush():
+        """
+        Commits data already written to the open log files to the SD card.
+        """
+        for fh in (Logger._log_fh, Logger._data_fh):
+            if fh is not None:
+                try:
+                    fh.flush()
+                except Exception as e:
+                    print(f"Failed to flush log file: {e}")
+
+    @staticmethod
+    def close():
+        """
+        Flushes all buffers and closes the log files. Called before a shutdown or reset.
+        """
+        Logger.flush_all_buffers()
+        for fh in (Logger._log_fh, Logger._data_fh):
+            if fh is not None:
+                try:
+                    fh.close()
+                except Exception as e:
+                    print(f"Failed to close log file: {e}")
+        Logger._log_fh = None
+        Logger._data_fh = None
+
+    @staticmethod
+    async def drain_task():
+        """
+        Asynchronous task that writes the queued log and sensor data entries to the SD card.
 
-            # ---- Environmental Settings Commands ----
+        Buffers are flushed once they are half full, up to the last allocation unit boundary, and
+        both are flushed completely every minute regardless of size.
+        """
+        while True:
+            await asyncio.sleep(1)
+            if Logger._time_to_flush():
+                Logger.flush_all_buffers()
+            else:
+                if Logger._log_len >= Logger.LOG_BUFFER_SIZE // 2:
+                    Logger.flush_log_buffer(aligned=True)
+                if Logger._data_len >= Logger.DATA_BUFFER_SIZE // 2:
+                    Logger.flush_sensor_data_buffer(aligned=True)
 
-            elif command.startswith("SET_ALTITUDE"):
-                altitude = int(command.split(",")[1])
-                Logger.log_info(f"Set altitude command received: {altitude} meters")
-                self.sensor_manager.set_altitude(altitude)
+    @staticmethod
+    def _rotate(fh, path, rotated_path, mode):
+        """
+        Closes `fh`, moves its file to the rotated name (replacing the previous rotated
+        generation), and returns a handle to a fresh file at `path`.
 
-            elif command.startswith("SET_PRESSURE"):
-                pressure = int(command.split(",")[1])
-                Logger.log_info(f"Set pressure command received: {pressure} hPa")
-                self.sensor_manager.set_pressure_reference(pressure)
+        If the file cannot be moved, the returned handle reopens it at `path` instead, so logging
+        continues and the rotation is retried on the next flush.
+        """
+        fh.close()
+        try:
+            try:
+                os.remove(rotated_path)
+            except OSError:
+                pass  # No previous generation
+            os.rename(path, rotated_path)
+        except OSError as e:
+            print(f"Failed to rotate {path}: {e}")
+        return open(path, mode)
+
+    @staticmethod
+    def _data_written(nbytes):
+        """
+        Accounts for bytes written to the sensor data file and rotates it at MAX_LOG_BYTES.
+        """
+        Logger._data_bytes += nbytes
+        if Logger._data_bytes >= Logger.MAX_LOG_BYTES:
+            fh = Logger._data_fh
+            Logger._data_fh = None
+            Logger._data_fh = Logger._rotate(fh, Logger.DATA_LOG_FILE, Logger.DATA_LOG_FILE_ROTATED, 'ab')
+            Logger._data_bytes = os.stat(Logger.DATA_LOG_FILE)[6]
+
+    @staticmethod
+    def _log(fmt, message, immediate):
+        """
+        Timestamps a message with one of the log line formats, queues it for the drain task and
+        echoes it to the console. Shared by log_info, log_error and log_traceback_error.
 
-            # ---- System Cycle and CO2 Interval Commands ----
+        Args:
+            fmt (str): `_INFO_FMT`, `_ERROR_FMT` or `_TRACEBACK_FMT`.
+            message (str): The message to be logged.
+            immediate (bool): Write to the console now rather than with the next log flush.
+        """
+        log_entry = fmt % (Logger.get_rtc_time(), message)
 
-            elif command.startswith("SET_CYCLE_MINS"):
-                new_cycle = int(command.split(",")[1])
-                Logger.log_info(f"Set cycle command received: {new_cycle} minute(s)")
-                # Update the system's sensor query interval
-                self.sensor_manager.set_cycle(new_cycle)
+        # Queue for the drain task; without an SD card the entry only goes to the console
+        if Logger._log_fh is not None:
+            Logger._log_len = Logger._append(Logger._log_buf, Logger._log_len, log_entry)
 
-            elif command.startswith("SET_CO2_INTERVAL"):
-                interval = int(command.split(",")[1])
-                Logger.log_info(f"Set CO2 interval command received: {interval} second(s)")
-                self.sensor_manager.set_co2_interval(interval)
+        Logger._echo(log_entry, immediate)
 
-            # ---- System Commands ----
+    @staticmethod
+    def _echo(entry, immediate):
+        """
+        Writes a log entry to the console now, or queues it for the next log buffer flush.
+        """
+        if immediate:
+            sys.stdout.write(entry)  # Entries already end in "\n"; skip print's separator handling
+        else:
+            Logger._enqueue(Logger._console_buffer, entry)
 
-            elif command == "SHUTDOWN":
-                Logger.log_info("Shutdown command received. Flushing buffers and shutting down.")
-                Logger.flush_all_buffers()  # Ensure all logs are written
-                self.sensor_manager.shutdown_pico()
+    @staticmethod
+    def _write_buffer(fh, buf, length, file_bytes, aligned):
+        """
+        Writes the first `length` bytes of a log byte buffer to `fh`.
 
-            elif command == "RESET_PICO":
-                Logger.log_info("Reset command received. Flushing buffers and resetting.")
-                Logger.flush_all_buffers()  # Ensure all logs are written
-                microcontroller.reset()
+        With `aligned`, only the prefix that brings the file (currently `file_bytes` long) to a
+        multiple of `_write_align` is written, and the unwritten tail is moved to the front of the
+        buffer for the next flush.
 
-            # ---- Invalid Command ----
+        Returns:
+            int: The number of bytes written.
+        """
+        count = length
+        if aligned:
+            align = Logger._write_align
+            count = (file_bytes + length) // align * align - file_bytes
+            if count <= 0:
+                return 0
+        fh.write(memoryview(buf)[:count])
+        if count < length:
+            # The tail can be longer than the written prefix, so the source and destination may
+            # overlap; copy it out first
+            buf[:length - count] = bytes(memoryview(buf)[count:length])
+        return count
+
+    @staticmethod
+    def _append(buf, length, entry):
+        """
+        Encodes an entry into a log byte buffer after its first `length` bytes.
 
-            else:
-                Logger.log_error(f"Invalid command received: {command}")
+        Returns:
+            int: The new filled length. If the entry does not fit it is dropped and `length` is
+            returned unchanged, so the caller never writes to the SD card itself.
+        """
+        data = entry.encode()
+        end = length + len(data)
+        if end > len(buf):
+            return length
+        buf[length:end] = data
+        return end
+
+    @staticmethod
+    def _enqueue(buffer, entry):
+        """
+        Appends an entry to a log buffer, dropping the oldest entry once BUFFER_MAX is reached.
+        """
+        if len(buffer) >= Logger.BUFFER_MAX:
+            del buffer[0]
+        buffer.append(entry)
 
-        except Exception as e:
-            Logger.log_traceback_error(e)  # Log detailed error information if exceptions occur
+    @staticmethod
+    def _time_to_flush():
+        """
+        Determines if it is time to flush based on a periodic interval (e.g., 1 minute).
+        Returns:
+            bool: True if it has been more than 1 minute since the last flush, False otherwise.
+        """
+        current_time = time.monotonic()
+        if current_time - Logger.last_flush_time >= 60:  # 1 minute
+            Logger.last_flush_time = current_time
+            return True
+        return False
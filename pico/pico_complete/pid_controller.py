@@ -7,14 +7,23 @@ It uses three terms:
 - Integral: Accumulates past errors to correct for long-term bias.
 - Derivative: Predicts future error based on the rate of change.
 
+The controller uses the incremental (velocity) form: each call computes the change in output from
+the last two errors and measurements and adds it to the previous output. There is no growing
+integral sum to wind up or drift. Clamping the stored output to the actuator range (0-100% duty
+cycle) is the anti-windup. The derivative is taken on the measurement rather than the error, so
+setpoint changes do not cause a derivative kick.
+
 Dependencies:
 - time: For calculating time intervals between control loop executions.
 """
 
 import time
 
+# Relative deviation from dt_nominal within which compute() uses the precomputed gain products
+_DT_TOLERANCE = 0.02
+
 class PIDController:
-    def __init__(self, Kp, Ki, Kd, setpoint):
+    def __init__(self, Kp, Ki, Kd, setpoint, out_min=0, out_max=100, dt_nominal=None):
         """
         Initializes the PID controller with given parameters.
 
@@ -23,14 +32,21 @@ class PIDController:
             Ki (float): Integral gain, controls the reaction based on cumulative past errors.
             Kd (float): Derivative gain, controls the reaction based on the rate of error change.
             setpoint (float): The desired target value that the system should aim to achieve.
+            out_min (float): Lower bound for the output. Defaults to 0.
+            out_max (float): Upper bound for the output. Defaults to 100.
+            dt_nominal (float): Expected seconds between compute() calls, or None if the loop has
+                no fixed period. Defaults to None.
         """
-        self.Kp = Kp
-        self.Ki = Ki
-        self.Kd = Kd
+        self.set_gains(Kp, Ki, Kd, dt_nominal)
         self.setpoint = setpoint
-        self.integral = 0  # Sum of past errors (integral term)
-        self.prev_error = 0
-        self.prev_time = time.monotonic()
+        self.out_min = out_min
+        self.out_max = out_max
+        self.last_output = 0  # Output returned by the previous compute() call
+        self.prev_error = 0  # Error at the previous compute() call
+        self.prev_measurement = None  # Value passed to the previous compute() call
+        self.second_prev_measurement = None  # Value passed to the compute() call before that
+        self._monotonic_ns = time.monotonic_ns  # Bound once so compute() skips the module lookup
+        self.prev_time_ns = self._monotonic_ns()
 
     def compute(self, current_value):
         """
@@ -40,41 +56,90 @@ class PIDController:
             current_value (float): The current value of the system being controlled.
 
         Returns:
-            float: The PID output, which can be used to control the system.
+            float: The PID output, clamped to [out_min, out_max], which can be used to control the system.
         """
-        # Calculate error
-        error = self.setpoint - current_value
-
-        # Calculate time elapsed since the last computation
-        current_time = time.monotonic()
-        delta_time = current_time - self.prev_time
-
-        if delta_time <= 0:
-            return 0
-
-        # Proportional term
-        P = self.Kp * error
-
-        # Integral term
-        self.integral += error * delta_time
-        I = self.Ki * self.integral
+        # Calculate time elapsed since the last computation; integer nanoseconds keep the guard
+        # exact, and only the final interval is converted to float seconds
+        current_time_ns = self._monotonic_ns()
+        delta_ns = current_time_ns - self.prev_time_ns
 
-        # Derivative term
-        derivative = (error - self.prev_error) / delta_time
-        D = self.Kd * derivative
+        if delta_ns <= 0:
+            return self.last_output  # No time has passed; hold the actuator where it is
+        delta_time = delta_ns * 1e-9
 
-        # Compute PID output
-        output = P + I + D
-
-        # Update previous values for the next iteration
+        # Calculate error
+        error = self.setpoint - current_value
+        prev_error = self.prev_error
+
+        # Missing history is filled with the current value, so the first call has no derivative
+        # and the second takes a plain first difference
+        prev_measurement = self.prev_measurement
+        if prev_measurement is None:
+            prev_measurement = current_value
+        second_prev_measurement = self.second_prev_measurement
+        if second_prev_measurement is None:
+            second_prev_measurement = prev_measurement
+
+        # Output increment: change in P, new I slice, and change in derivative-on-measurement.
+        # At the nominal loop period the dt scaling is already folded into the gains.
+        p_contrib = self.Kp * (error - prev_error)
+        curvature = current_value - 2 * prev_measurement + second_prev_measurement
+        dt_nominal = self.dt_nominal
+        if dt_nominal is not None and abs(delta_time - dt_nominal) < _DT_TOLERANCE * dt_nominal:
+            i_contrib = self._bi * error
+            d_contrib = -self._bd * curvature
+        else:
+            i_contrib = self.Ki * error * delta_time
+            d_contrib = -self.Kd * curvature / delta_time
+
+        # Limit to the actuator range; storing the clamped value is what prevents windup
+        output = self.last_output + p_contrib + i_contrib + d_contrib
+        out_max = self.out_max
+        out_min = self.out_min
+        if output > out_max:
+            output = out_max
+        elif output < out_min:
+            output = out_min
+
+        # Shift the history for the next iteration
+        self.last_output = output
         self.prev_error = error
-        self.prev_time = current_time
+        self.second_prev_measurement = prev_measurement
+        self.prev_measurement = current_value
+        self.prev_time_ns = current_time_ns
 
         return output
 
+    def set_gains(self, Kp, Ki, Kd, dt_nominal=None):
+        """
+        Sets the PID gains and precomputes their products with the nominal loop period. Change the
+        gains through this method rather than assigning Kp, Ki or Kd directly, so the cached
+        products stay in step.
+
+        Args:
+            Kp (float): Proportional gain.
+            Ki (float): Integral gain.
+            Kd (float): Derivative gain.
+            dt_nominal (float): Expected seconds between compute() calls, or None to always scale
+                by the measured interval. Defaults to None.
+        """
+        self.Kp = Kp
+        self.Ki = Ki
+        self.Kd = Kd
+        self.dt_nominal = dt_nominal
+        if dt_nominal is not None:
+            self._bi = Ki * dt_nominal  # Integral gain per nominal step
+            self._bd = Kd / dt_nominal  # Derivative gain per nominal step
+        else:
+            self._bi = self._bd = None
+
     def reset_integral(self):
         """
-        Resets the integral component of the PID controller.
-        This helps in preventing integral windup in cases where the system output is saturated.
+        Resets the accumulated output of the PID controller, so the next compute() starts from zero
+        as if the controller had just been created.
         """
-        self.integral = 0
+        self.last_output = 0
+        self.prev_error = 0
+        self.prev_measurement = None
+        self.second_prev_measurement = None
+        self.prev_time_ns = self._monotonic_ns()
@@ -22,9 +22,14 @@ Dependencies:
 - adafruit_ds18x20: For the DS18B20 temperature sensor (OneWire).
 - logger: For logging sensor data and system information.
 - alarm and microcontroller: For shutdown and reset functionality.
+- micropython: For compile-time integer constants.
 """
 
 import time
+import asyncio
+import struct
+from array import array
+from micropython import const
 import board
 import busio
 import adafruit_scd30
@@ -36,58 +41,184 @@ from logger import Logger
 import alarm
 import microcontroller
 
+# Sensor wiring: I2C (SCD30, BMP280, DS3231) on GP21/GP20, OneWire (DS18B20) on GP18
+_SDA_PIN = board.GP21
+_SCL_PIN = board.GP20
+_ONEWIRE_PIN = board.GP18
+
+# I2C clock. BMP280 and DS3231 are rated for 400kHz fast mode; the SCD30 datasheet specifies
+# 100kHz but it runs at 400kHz on short traces. Pass i2c_frequency=100_000 for long wiring.
+_I2C_FREQUENCY = const(400_000)
+
+# Attempts made to bring up each sensor group before initialization fails
+_INIT_TRIES = const(3)
+
+# Ring buffer capacity for sensor readings (a power of two, so indices wrap with a bitmask)
+_BUFFER_SIZE = const(64)
+_BUF_MASK = const(_BUFFER_SIZE - 1)
+_FLUSH_THRESHOLD = const(_BUFFER_SIZE // 2)  # Background flush starts once the ring is half full
+
+# Default DS18B20 resolution in bits. 10 bits gives 0.25°C steps in a 187.5ms conversion, against
+# 0.0625°C in 750ms at the 12-bit default (9 bits: 0.5°C, 93.75ms). The heater PID runs every few
+# seconds on a slow thermal mass, so 0.25°C is sufficient; see set_temperature_resolution().
+_DS18B20_RESOLUTION = const(10)
+
+# DS18B20 conversion time in seconds for each resolution in bits
+_DS18B20_CONVERSION_S = {9: 0.09375, 10: 0.1875, 11: 0.375, 12: 0.75}
+
+# OneWire SKIP ROM (address every device) followed by CONVERT T
+_CONVERT_ALL = b"\xCC\x44"
+
+# I2C bus shared by every SensorManager; created on first use by _get_i2c()
+_I2C_BUS = None
+_I2C_BUS_FREQUENCY = None  # Clock _I2C_BUS was created with; busio.I2C does not expose it
+
+def _make_crc8_table():
+    """
+    Builds the 256-entry lookup table for the Sensirion CRC-8 (polynomial 0x31).
+    """
+    table = bytearray(256)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x31) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table[i] = crc
+    return bytes(table)
+
+_CRC8_TABLE = _make_crc8_table()
+
+def _crc8(buf, start):
+    """
+    Computes the Sensirion CRC-8 (polynomial 0x31, init 0xFF) of the 2-byte word at `buf[start]`,
+    one table lookup per byte.
+    """
+    return _CRC8_TABLE[_CRC8_TABLE[0xFF ^ buf[start]] ^ buf[start + 1]]
+
+def _get_i2c(frequency=_I2C_FREQUENCY):
+    """
+    Returns the shared I2C bus (GP21/GP20), creating it on first use. Re-initializing sensors
+    reuses the bus rather than claiming the already-used pins a second time.
+
+    Args:
+        frequency (int): Bus clock in Hz, applied when the bus is created. The existing bus keeps
+            its clock; a different request is logged as an error.
+    """
+    global _I2C_BUS, _I2C_BUS_FREQUENCY
+    if _I2C_BUS is None:
+        _I2C_BUS = busio.I2C(_SDA_PIN, _SCL_PIN, frequency=frequency)
+        _I2C_BUS_FREQUENCY = frequency
+    elif _I2C_BUS_FREQUENCY != frequency:
+        Logger.log_error(f"I2C bus already running at {_I2C_BUS_FREQUENCY} Hz; "
+                         f"ignoring request for {frequency} Hz.")
+    return _I2C_BUS
+
+def _retry(fn, name, tries=_INIT_TRIES, base=0.05):
+    """
+    Calls `fn()` until it succeeds, sleeping `base * 2**attempt` seconds between failed attempts.
+
+    Args:
+        fn (callable): The initialization step to run.
+        name (str): What is being initialized, for the log.
+        tries (int): Total number of attempts. Defaults to `_INIT_TRIES`.
+        base (float): Delay after the first failure, in seconds. Defaults to 0.05.
+
+    Returns:
+        The value returned by `fn`.
+
+    Raises:
+        Exception: Whatever the last attempt raised.
+    """
+    for attempt in range(tries):
+        try:
+            return fn()
+        except Exception as e:
+            Logger.log_error(f"Failed to initialize {name} on attempt {attempt + 1}: {e}")
+            if attempt == tries - 1:
+                raise
+            time.sleep(base * (1 << attempt))
+
 class SensorManager:
     """
     SensorManager class manages the initialization, reading, and management of all connected sensors.
     It also provides system power management functions such as shutdown and reset.
     """
 
-    def __init__(self):
+    def __init__(self, i2c_frequency=_I2C_FREQUENCY):
         """
         Initializes the SensorManager class attributes. Sensors are initially set to None and assigned
         during the initialization process.
+
+        Args:
+            i2c_frequency (int): I2C bus clock in Hz. Defaults to 400kHz; use 100_000 if the SCD30
+                is on long wiring.
         """
+        self.i2c_frequency = i2c_frequency
         self.scd30 = None  # SCD30 CO2, temperature, and humidity sensor
         self.bmp280 = None  # BMP280 pressure sensor
         self.rtc = None  # DS3231 real-time clock
         self.ds18b20 = None  # DS18B20 temperature sensor
-        self.sensor_data_buffer = []  # Buffer for storing sensor data before logging to SD card
+        # Structure-of-arrays ring buffer for sensor data awaiting the SD card, one array per quantity
+        self._buf_co2 = array("f", [0.0] * _BUFFER_SIZE)
+        self._buf_temp = array("f", [0.0] * _BUFFER_SIZE)
+        self._buf_hum = array("f", [0.0] * _BUFFER_SIZE)
+        self._buf_ds_temp = array("f", [0.0] * _BUFFER_SIZE)
+        self._buf_pressure = array("f", [0.0] * _BUFFER_SIZE)
+        self._buf_write = 0  # Total readings written into the ring
+        self._buf_read = 0  # Total readings flushed to the SD card
+        self._io_buf = bytearray(32)  # Shared scratch buffer for raw I2C sensor transactions
+        self._scd30_last = (0.0, 0.0, 0.0)  # Last decoded SCD30 (CO2, temperature, humidity)
+        self._ds_last = None  # Last DS18B20 temperature, or None before the first reading
+        self._ds_ready_ns = 0  # monotonic_ns() when the pending DS18B20 conversion completes, or 0
+        self._ds_resolution = _DS18B20_RESOLUTION  # Resolution the DS18B20 was last set to
+        self._onewire_bus = None  # OneWire bus shared by every DS18B20
 
     def initialize_sensors(self):
         """
         Initializes all connected sensors (SCD30, BMP280, DS3231, DS18B20).
-        Raises an exception if any sensor fails to initialize.
+        Each bus is created once; only the device probing is retried, with exponential backoff.
+        Raises an exception if any sensor still fails to initialize.
         """
         try:
             # I2C sensor initialization (SCD30, BMP280, DS3231)
-            i2c = busio.I2C(board.GP21, board.GP20)
-
-            # Initialize SCD30 CO2 sensor
-            self.scd30 = adafruit_scd30.SCD30(i2c)
-            # Initialize BMP280 pressure sensor
-            self.bmp280 = adafruit_bmp280.Adafruit_BMP280_I2C(i2c)
-            # Initialize DS3231 real-time clock
-            self.rtc = adafruit_ds3231.DS3231(i2c)
-
-            Logger.log_info("I2C sensors (SCD30, BMP280, DS3231) initialized successfully.")
+            i2c = _get_i2c(self.i2c_frequency)
+            self.scd30, self.bmp280, self.rtc = _retry(lambda: (
+                adafruit_scd30.SCD30(i2c),  # SCD30 CO2 sensor
+                adafruit_bmp280.Adafruit_BMP280_I2C(i2c),  # BMP280 pressure sensor
+                adafruit_ds3231.DS3231(i2c),  # DS3231 real-time clock
+            ), "I2C sensors")
+
+            Logger.log_info("I2C sensors (SCD30, BMP280, DS3231) initialized successfully at %d Hz.",
+                            _I2C_BUS_FREQUENCY)
         except Exception as e:
             Logger.log_error(f"Failed to initialize I2C sensors: {e}")
             raise RuntimeError("Critical failure: I2C sensor initialization failed.") from e
 
         # DS18B20 temperature sensor initialization (OneWire protocol)
         try:
-            onewire_bus = OneWireBus(board.GP18)
-            devices = onewire_bus.scan()
-            if not devices:
-                raise RuntimeError("No DS18B20 temperature sensor found.")
-
-            # Initialize the first detected DS18B20 sensor
-            self.ds18b20 = adafruit_ds18x20.DS18X20(onewire_bus, devices[0])
+            onewire_bus = OneWireBus(_ONEWIRE_PIN)
+            self.ds18b20 = _retry(lambda: self._find_ds18b20(onewire_bus), "DS18B20 sensor")
+            self._onewire_bus = onewire_bus
             Logger.log_info("DS18B20 temperature sensor initialized successfully.")
         except Exception as e:
             Logger.log_error(f"Failed to initialize DS18B20 sensor: {e}")
             raise RuntimeError("Critical failure: DS18B20 sensor initialization failed.") from e
 
+    def _find_ds18b20(self, onewire_bus):
+        """
+        Scans the OneWire bus and returns a driver for the first detected DS18B20 sensor, set to
+        `_DS18B20_RESOLUTION` bits.
+
+        Raises:
+            RuntimeError: If no device answers on the bus.
+        """
+        devices = onewire_bus.scan()
+        if not devices:
+            raise RuntimeError("No DS18B20 temperature sensor found.")
+        ds18b20 = adafruit_ds18x20.DS18X20(onewire_bus, devices[0])
+        ds18b20.resolution = _DS18B20_RESOLUTION
+        self._ds_resolution = _DS18B20_RESOLUTION
+        return ds18b20
+
     def get_temperature(self):
         """
         Reads the current temperature from the DS18B20 sensor.
@@ -96,56 +227,144 @@ class SensorManager:
             float: The current temperature in degrees Celsius.
 
         Raises:
-            RuntimeError: If the DS18B20 sensor is not initialized or fails to provide a reading.
+            Exception: Whatever the DS18B20 driver raises; the caller logs it.
         """
-        try:
-            return self.ds18b20.temperature
-        except Exception as e:
-            Logger.log_error(f"Failed to read temperature from DS18B20: {e}")
-            raise RuntimeError("Critical failure: Unable to read temperature.") from e
+        return self.ds18b20.temperature
 
-    def read_sensors(self):
+    def _read_scd30(self):
         """
-        Reads the current data from all connected sensors.
+        Reads CO2, temperature, and humidity from the SCD30 in a single I2C transaction.
+
+        The 18-byte measurement frame is read into the shared `_io_buf` and the three big-endian
+        floats are decoded in place, so a steady-state read allocates no new I/O buffers. When the
+        sensor has no new measurement, the previously decoded values are returned.
 
         Returns:
-            tuple: CO2 (ppm), temperature (°C), humidity (%), DS18B20 temperature (°C), and pressure (hPa).
+            tuple: CO2 (ppm), temperature (°C), and relative humidity (%).
 
         Raises:
-            RuntimeError: If any sensor fails to provide data.
+            RuntimeError: If the measurement frame fails its CRC check.
         """
-        try:
-            co2 = self.scd30.CO2
-            temperature = self.scd30.temperature
-            humidity = self.scd30.relative_humidity
-            ds_temp = self.get_temperature()
-            pressure = self.bmp280.pressure
+        if not self.scd30.data_available:
+            return self._scd30_last
+
+        buf = self._io_buf
+        with self.scd30.i2c_device as i2c:
+            i2c.write(b"\x03\x00")  # Read measurement command
+            time.sleep(0.003)
+            i2c.readinto(buf, end=18)
+
+        # Each 2-byte word is followed by a CRC byte; pack the six words into buf[18:30]
+        for i in range(6):
+            j = i * 3
+            if _crc8(buf, j) != buf[j + 2]:
+                raise RuntimeError("SCD30 measurement CRC mismatch.")
+            buf[18 + i * 2] = buf[j]
+            buf[19 + i * 2] = buf[j + 1]
+
+        self._scd30_last = struct.unpack_from(">fff", buf, 18)
+        return self._scd30_last
+
+    def _trigger_all_temps(self):
+        """
+        Starts a temperature conversion on every DS18B20 on the bus with one broadcast (SKIP ROM,
+        CONVERT T), so no device address is sent and all sensors convert in parallel.
 
-            # Add data to the buffer
-            self.sensor_data_buffer.append((co2, temperature, humidity, ds_temp, pressure))
+        Returns:
+            float: Seconds until the conversion completes.
+        """
+        bus = self._onewire_bus
+        bus.reset()
+        bus.write(_CONVERT_ALL)
+        return _DS18B20_CONVERSION_S[self._ds_resolution]
 
-            return co2, temperature, humidity, ds_temp, pressure
-        except Exception as e:
-            Logger.log_error(f"Failed to read sensor data: {e}")
-            raise RuntimeError("Critical failure: Unable to read sensor data.") from e
+    def _read_ds18b20(self):
+        """
+        Returns the DS18B20 temperature without waiting on a conversion.
+
+        A conversion is started after every reading and collected on a later call once its
+        conversion time has passed; until then the previous reading is returned. Only the very
+        first call blocks for a full conversion, so there is always a value to return.
+
+        Returns:
+            float: The most recent temperature in degrees Celsius.
+        """
+        ds18b20 = self.ds18b20
+        if self._ds_ready_ns:
+            if time.monotonic_ns() < self._ds_ready_ns:
+                return self._ds_last
+            self._ds_last = ds18b20.read_temperature()
+        elif self._ds_last is None:
+            self._ds_last = ds18b20.temperature
+
+        # Kick off the next conversion, then only the scratchpad is read once it is due
+        delay = self._trigger_all_temps()
+        self._ds_ready_ns = time.monotonic_ns() + int(delay * 1_000_000_000)
+        return self._ds_last
+
+    def read_sensors(self):
+        """
+        Reads the current data from all connected sensors. The SCD30 and DS18B20 are only read
+        when they have a fresh measurement; otherwise their last values are returned, so the call
+        does not stall on a sensor conversion.
+
+        Returns:
+            tuple: CO2 (ppm), temperature (°C), humidity (%), DS18B20 temperature (°C), and pressure (hPa).
+
+        Raises:
+            Exception: Whatever the failing sensor driver raises. Every caller already logs the
+                traceback, so the original exception propagates unwrapped.
+        """
+        co2, temperature, humidity = self._read_scd30()
+        ds_temp = self._read_ds18b20()
+        pressure = self.bmp280.pressure
+
+        # Add data to the ring buffer; flush synchronously only if the background task fell behind
+        if self._buf_write - self._buf_read >= _BUFFER_SIZE:
+            self.write_sensor_data_to_sd()
+        i = self._buf_write & _BUF_MASK
+        self._buf_co2[i] = co2
+        self._buf_temp[i] = temperature
+        self._buf_hum[i] = humidity
+        self._buf_ds_temp[i] = ds_temp
+        self._buf_pressure[i] = pressure
+        self._buf_write += 1
+
+        return co2, temperature, humidity, ds_temp, pressure
 
     def write_sensor_data_to_sd(self):
         """
-        Writes the buffered sensor data to the SD card. This method flushes the buffer.
+        Hands the buffered sensor data to the logger, which queues it for `Logger.drain_task` to
+        write to the SD card. This method empties the ring buffer.
         """
         try:
-            if self.sensor_data_buffer:
-                for data in self.sensor_data_buffer:
-                    co2, temperature, humidity, ds_temp, pressure = data
-                    Logger.log_sensor_data(ds_temp, self.scd30.temperature, self.scd30.CO2)
-                    Logger.log_info(f"Buffered Sensor Data: CO2: {co2} ppm, Temp: {temperature}°C, Humidity: {humidity}%, Pressure: {pressure} hPa")
-
-                # Clear the buffer after writing to SD card
-                self.sensor_data_buffer.clear()
+            count = self._buf_write - self._buf_read
+            if count:
+                Logger.log_sensor_data_batch(count, self._buf_co2, self._buf_temp, self._buf_hum,
+                                             self._buf_ds_temp, self._buf_pressure,
+                                             start=self._buf_read & _BUF_MASK)
+
+                # Advance the read position past the flushed readings
+                self._buf_read += count
         except Exception as e:
             Logger.log_error(f"Failed to write buffered sensor data: {e}")
             raise RuntimeError("Critical failure: Unable to write buffered data.") from e
 
+    async def sensor_data_flush_task(self):
+        """
+        Asynchronous task that flushes the sensor data ring buffer in the background.
+
+        The ring buffer is handed to the logger once it is half full, so reading sensors and
+        responding to commands never stalls on a synchronous flush.
+        """
+        while True:
+            if self._buf_write - self._buf_read >= _FLUSH_THRESHOLD:
+                try:
+                    self.write_sensor_data_to_sd()
+                except Exception as e:
+                    Logger.log_traceback_error(e)
+            await asyncio.sleep(1)
+
     def send_sensor_data(self, feed_amount=None, recalibration_value=None):
         """
         Logs current sensor data. Optionally logs feed operation and sensor recalibration.
@@ -153,23 +372,20 @@ class SensorManager:
         Args:
             feed_amount (str): Amount of feed to log (optional).
             recalibration_value (int): Recalibration value for SCD30 CO2 sensor (optional).
-        """
-        try:
-            co2, temp, humidity, ds_temp, pressure = self.read_sensors()
 
-            if len(self.sensor_data_buffer) >= 50:  # Adjustable buffer size for periodic flush
-                self.write_sensor_data_to_sd()
+        Raises:
+            Exception: Whatever read_sensors() raises; the command handlers log it.
+        """
+        co2, temp, humidity, ds_temp, pressure = self.read_sensors()
 
-            Logger.log_info(f"Sensor data: CO2={co2} ppm, Temp={temp}°C, Humidity={humidity}%, Pressure={pressure} hPa")
+        Logger.log_info("Sensor data: CO2=%s ppm, Temp=%s°C, Humidity=%s%%, Pressure=%s hPa",
+                        co2, temp, humidity, pressure)
 
-            if feed_amount:
-                Logger.log_info(f"Feed operation logged: {feed_amount} grams")
+        if feed_amount:
+            Logger.log_info("Feed operation logged: %s grams", feed_amount)
 
-            if recalibration_value:
-                Logger.log_info(f"SCD30 CO2 recalibrated to: {recalibration_value} ppm")
-        except Exception as e:
-            Logger.log_error(f"Failed to send sensor data: {e}")
-            raise RuntimeError("Critical failure: Unable to send sensor data.") from e
+        if recalibration_value:
+            Logger.log_info("SCD30 CO2 recalibrated to: %s ppm", recalibration_value)
 
     def shutdown_pico(self):
         """
@@ -193,15 +409,40 @@ class SensorManager:
             str: The current time in "YYYY-MM-DD HH:MM:SS" format.
 
         Raises:
-            RuntimeError: If the RTC fails to provide the current time.
+            Exception: Whatever the DS3231 driver raises; the REQUEST_RTC_TIME handler logs it.
+        """
+        # Index the struct_time and format once instead of six attribute lookups
+        t = self.rtc.datetime
+        return "%04d-%02d-%02d %02d:%02d:%02d" % (t[0], t[1], t[2], t[3], t[4], t[5])
+
+    def sync_rtc_time(self, timestamp_str):
+        """
+        Synchronizes the RTC time with a timestamp received from the Raspberry Pi.
+
+        The timestamp has a fixed "YYYY-MM-DD HH:MM:SS" layout, so the fields are parsed by
+        position rather than through time.strptime (unavailable or costly on CircuitPython).
+
+        Args:
+            timestamp_str (str): The timestamp to apply (e.g., "2024-09-13 14:30:00").
+
+        Raises:
+            RuntimeError: If the timestamp is malformed or the RTC cannot be updated.
         """
         try:
-            rtc_time = self.rtc.datetime
-            return f"{rtc_time.tm_year}-{rtc_time.tm_mon:02}-{rtc_time.tm_mday:02} " \
-                   f"{rtc_time.tm_hour:02}:{rtc_time.tm_min:02}:{rtc_time.tm_sec:02}"
+            ts = timestamp_str.strip()
+            if len(ts) != 19:
+                raise ValueError(f"Expected 'YYYY-MM-DD HH:MM:SS', got {ts!r}")
+            year = int(ts[0:4])
+            month = int(ts[5:7])
+            day = int(ts[8:10])
+            hour = int(ts[11:13])
+            minute = int(ts[14:16])
+            second = int(ts[17:19])
+            self.rtc.datetime = time.struct_time((year, month, day, hour, minute, second, 0, -1, -1))
+            Logger.log_info("RTC time synchronized to: %s", ts)
         except Exception as e:
-            Logger.log_error(f"Failed to retrieve RTC time: {e}")
-            raise RuntimeError("Critical failure: Unable to retrieve RTC time.") from e
+            Logger.log_error(f"Failed to sync RTC time: {e}")
+            raise RuntimeError("Critical failure: RTC sync failed.") from e
 
     def set_altitude(self, altitude):
         """
@@ -215,7 +456,7 @@ class SensorManager:
         """
         try:
             self.scd30.altitude = altitude
-            Logger.log_info(f"SCD30 altitude set to: {altitude} meters")
+            Logger.log_info("SCD30 altitude set to: %s meters", altitude)
         except Exception as e:
             Logger.log_error(f"Failed to set altitude: {e}")
             raise RuntimeError("Critical failure: Unable to set altitude.") from e
@@ -232,7 +473,7 @@ class SensorManager:
         """
         try:
             self.bmp280.sea_level_pressure = pressure
-            Logger.log_info(f"BMP280 pressure reference set to: {pressure} hPa")
+            Logger.log_info("BMP280 pressure reference set to: %s hPa", pressure)
         except Exception as e:
             Logger.log_error(f"Failed to set pressure reference: {e}")
             raise RuntimeError("Critical failure: Unable to set pressure reference.") from e
@@ -249,11 +490,31 @@ class SensorManager:
         """
         try:
             self.scd30.measurement_interval = interval
-            Logger.log_info(f"SCD30 CO2 interval set to: {interval} seconds")
+            Logger.log_info("SCD30 CO2 interval set to: %s seconds", interval)
         except Exception as e:
             Logger.log_error(f"Failed to set CO2 interval: {e}")
             raise RuntimeError("Critical failure: Unable to set CO2 interval.") from e
 
+    def set_temperature_resolution(self, bits):
+        """
+        Sets the DS18B20 conversion resolution. Each extra bit halves the temperature step and
+        doubles the conversion time (9 bits: 0.5°C in 93.75ms, up to 12 bits: 0.0625°C in 750ms).
+
+        Args:
+            bits (int): Resolution in bits (9-12).
+
+        Raises:
+            RuntimeError: If the resolution cannot be set.
+        """
+        try:
+            self.ds18b20.resolution = bits
+            self._ds_resolution = bits
+            self._ds_ready_ns = 0  # A conversion started at the old resolution is not collected
+            Logger.log_info("DS18B20 resolution set to: %s bits", bits)
+        except Exception as e:
+            Logger.log_error(f"Failed to set temperature resolution: {e}")
+            raise RuntimeError("Critical failure: Unable to set temperature resolution.") from e
+
     def set_cycle(self, cycle_duration):
         """
         Adjusts the sensor data query cycle duration.
@@ -266,16 +527,7 @@ class SensorManager:
         """
         try:
             self.query_cycle_duration = cycle_duration * 60  # Convert minutes to seconds
-            Logger.log_info(f"Sensor query cycle set to: {cycle_duration} minutes.")
+            Logger.log_info("Sensor query cycle set to: %s minutes.", cycle_duration)
         except Exception as e:
             Logger.log_error(f"Failed to set sensor query cycle: {e}")
             raise RuntimeError("Critical failure: Unable to set query cycle.") from e
-
-    def get_cycle_duration(self):
-        """
-        Retrieves the current sensor query cycle duration.
-
-        Returns:
-            int: Current cycle duration in seconds.
-        """
-        return self.query_cycle_duration
\ No newline at end of file
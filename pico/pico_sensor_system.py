@@ -10,7 +10,9 @@ It supports:
 - Entering deep sleep and waking via GPIO.
 """
 
+import sys
 import time
+import struct
 import board
 import busio
 import adafruit_scd30
@@ -30,24 +32,48 @@ import adafruit_ds18x20  # For DS18B20 temperature sensor
 sensor_query_cycle_mins = 3  # Time interval for querying sensor data (in minutes)
 cycle = sensor_query_cycle_mins * 60  # Convert minutes to seconds
 
+# The CSV data file stays open between rows and is flushed every CSV_FLUSH_ROWS rows
+CSV_FLUSH_ROWS = 4
+data_file = None
+data_rows_pending = 0
+
+def close_data_file():
+    """Flushes and closes the CSV data file, if it is open."""
+    global data_file, data_rows_pending
+    if data_file is None:
+        return
+    try:
+        data_file.close()  # Closing flushes any buffered rows
+    except Exception as e:
+        print(f"Failed to close data file: {e}")
+    data_file = None
+    data_rows_pending = 0
+
 # Function to reset the Pico
 def reset_pico():
     """Resets the Pico after a 30-second wait to allow safe shutdown of tasks."""
+    close_data_file()
     print("Resetting the Pico in 30 seconds...")
     time.sleep(30)
     microcontroller.reset()
 
-# I2C initialization with retries
+# I2C initialization with retries. The first attempt runs the bus at 400kHz fast mode; if the
+# devices do not answer (e.g. weak pull-ups or long wires), later attempts drop to 100kHz.
+i2c = None
 for attempt in range(3):
+    i2c_frequency = 400000 if attempt == 0 else 100000
     try:
-        i2c = busio.I2C(board.GP21, board.GP20)
+        i2c = busio.I2C(board.GP21, board.GP20, frequency=i2c_frequency)
         scd30 = adafruit_scd30.SCD30(i2c)
         bmp280 = adafruit_bmp280.Adafruit_BMP280_I2C(i2c)
         rtc = adafruit_ds3231.DS3231(i2c)
-        print("I2C devices initialized successfully.")
+        print(f"I2C devices initialized successfully at {i2c_frequency} Hz.")
         break
     except Exception as e:
         print(f"Failed to initialize I2C devices on attempt {attempt + 1}: {e}")
+        if i2c is not None:
+            i2c.deinit()  # Release GP21/GP20 so the next attempt can claim them
+            i2c = None
         if attempt == 2:
             reset_pico()
 
@@ -67,6 +93,54 @@ for attempt in range(3):
         if attempt == 2:
             reset_pico()
 
+# SCD30 measurement frame: six 2-byte words, each followed by a CRC byte. The words are
+# repacked into bytes 18-29 of the same buffer for decoding.
+scd30_buf = bytearray(30)
+scd30_last = (0.0, 0.0, 0.0)  # Last decoded (CO2, temperature, humidity)
+
+def make_crc8_table():
+    """Builds the 256-entry lookup table for the Sensirion CRC-8 (polynomial 0x31)."""
+    table = bytearray(256)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x31) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table[i] = crc
+    return bytes(table)
+
+CRC8_TABLE = make_crc8_table()
+
+def crc8(buf, start):
+    """Computes the Sensirion CRC-8 (polynomial 0x31, init 0xFF) of the 2-byte word at buf[start]."""
+    return CRC8_TABLE[CRC8_TABLE[0xFF ^ buf[start]] ^ buf[start + 1]]
+
+def read_scd30():
+    """
+    Reads CO2 (ppm), temperature (°C) and humidity (%) from the SCD30 in one I2C transaction.
+    Reading the CO2, temperature and relative_humidity properties separately polls the
+    data-ready status for each of them. When the sensor has no new measurement, the previously
+    decoded values are returned.
+    """
+    global scd30_last
+    if not scd30.data_available:
+        return scd30_last
+
+    buf = scd30_buf
+    with scd30.i2c_device as i2c_dev:
+        i2c_dev.write(b"\x03\x00")  # Read measurement command
+        time.sleep(0.003)
+        i2c_dev.readinto(buf, end=18)
+
+    for i in range(6):
+        j = i * 3
+        if crc8(buf, j) != buf[j + 2]:
+            raise RuntimeError("SCD30 measurement CRC mismatch.")
+        buf[18 + i * 2] = buf[j]
+        buf[19 + i * 2] = buf[j + 1]
+
+    scd30_last = struct.unpack_from(">fff", buf, 18)
+    return scd30_last
+
 # Get current time from the RTC
 def get_rtc_time():
     rtc_time = rtc.datetime
@@ -186,18 +260,34 @@ def set_cycle(new_cycle):
         log_traceback_error(e)
         log_error("Failed to set sensor query cycle.")
 
+# Longest idle sleep between checks for serial commands in the main loop (seconds)
+COMMAND_POLL_INTERVAL = 0.1
+
 # CSV logging function
 DATA_LOG_FILE = "/sd/sensor_data.csv"
+CSV_ROW_FMT = "%s,%s,%s,%s,%s,%s,%s,%s\n"  # timestamp, CO2, probe temp, sensor temp, humidity, pressure, feed, recalibration
 
 def log_data_to_csv(timestamp, co2, probe_temp, sensor_temp, humidity, pressure, feed_amount=None, recalibration=None):
-    """Logs sensor data to the CSV file on the SD card."""
+    """
+    Logs sensor data to the CSV file on the SD card. The file is opened on first use and kept
+    open; rows are flushed to the card every CSV_FLUSH_ROWS rows and on shutdown or reset.
+    """
+    global data_file, data_rows_pending
     try:
-        with open(DATA_LOG_FILE, mode='a') as csvfile:
-            csvfile.write(f"{timestamp},{co2},{probe_temp},{sensor_temp},{humidity},{pressure},{feed_amount if feed_amount is not None else 'N/A'},{recalibration if recalibration is not None else 'N/A'}\n")
+        if data_file is None:
+            data_file = open(DATA_LOG_FILE, mode='a')
+        data_file.write(CSV_ROW_FMT % (timestamp, co2, probe_temp, sensor_temp, humidity, pressure,
+                                       'N/A' if feed_amount is None else feed_amount,
+                                       'N/A' if recalibration is None else recalibration))
+        data_rows_pending += 1
+        if data_rows_pending >= CSV_FLUSH_ROWS:
+            data_file.flush()
+            data_rows_pending = 0
         log_info(f"Data logged: CO2: {co2} ppm, Media Temp: {probe_temp}, Sensor Temp: {sensor_temp}°C, Humidity: {humidity}%, Pressure: {pressure} hPa, Feed Amount: {feed_amount}, Recalibration: {recalibration}")
     except Exception as e:
         log_traceback_error(e)
         log_error("Failed to log sensor data to CSV.")
+        close_data_file()  # Reopen on the next row in case the handle went bad
 
 # Function to update SCD30 altitude and pressure compensation
 def update_scd30_compensation():
@@ -224,9 +314,7 @@ def send_sensor_data(feed=None, recalibration=None):
         return
 
     try:
-        co2 = scd30.CO2
-        temperature = scd30.temperature
-        humidity = scd30.relative_humidity
+        co2, temperature, humidity = read_scd30()
         ds18b20_temperature = ds18b20.temperature
         pressure = bmp280.pressure
         timestamp = get_rtc_time()
@@ -242,6 +330,7 @@ def send_sensor_data(feed=None, recalibration=None):
 def shutdown_pico():
     """Shuts down the Pico and enters deep sleep."""
     log_info("Shutting down Pico and entering deep sleep.")
+    close_data_file()
     time.sleep(2)
     wake_alarm = alarm.pin.PinAlarm(pin=board.GP15, value=False, pull=True)
     alarm.exit_and_deep_sleep_until_alarms(wake_alarm)
@@ -265,12 +354,12 @@ def handle_commands(command):
     """Handles commands from the Raspberry Pi."""
     try:
         log_info(f"Received command: {command}")
-        if command.startswith("FEED"):
+        if command[:4] == "FEED":
             feed_amount = command.split(",")[1]
             log_info(f"Feed command received: {feed_amount} grams")
             send_sensor_data(feed_amount, None)
 
-        elif command.startswith("CALIBRATE"):
+        elif command[:9] == "CALIBRATE":
             recalibration_value = int(command.split(",")[1])
             scd30.forced_recalibration_reference = recalibration_value
             log_info(f"Recalibration command received: {recalibration_value} ppm")
@@ -284,7 +373,7 @@ def handle_commands(command):
             log_info("Shutdown command received.")
             shutdown_pico()
 
-        elif command.startswith("SYNC_TIME"):
+        elif command[:9] == "SYNC_TIME":
             log_info("Time sync command received.")
             sync_rtc_time(command)
 
@@ -293,22 +382,22 @@ def handle_commands(command):
             timestamp = get_rtc_time()
             print(f"RTC time: {timestamp}")
 
-        elif command.startswith("SET_ALTITUDE"):
+        elif command[:12] == "SET_ALTITUDE":
             altitude = command.split(",")[1]
             log_info(f"Set altitude command received: {altitude} meters")
             set_altitude(altitude)
 
-        elif command.startswith("SET_PRESSURE"):
+        elif command[:12] == "SET_PRESSURE":
             pressure = int(command.split(",")[1])
             log_info(f"Set pressure command received: {pressure} hPa")
             set_pressure_reference(pressure)
 
-        elif command.startswith("SET_CYCLE_MINS"):
+        elif command[:14] == "SET_CYCLE_MINS":
             new_cycle = int(command.split(",")[1])
             log_info(f"Set cycle command received: {new_cycle} minute(s)")
             set_cycle(new_cycle)
 
-        elif command.startswith("SET_CO2_INTERVAL"):
+        elif command[:16] == "SET_CO2_INTERVAL":
             interval = command.split(",")[1]
             log_info(f"Set CO2 interval command received: {interval} second(s)")
             set_co2_interval(interval)
@@ -339,6 +428,7 @@ def control_loop():
         log_traceback_error(e)
 
     last_reading_time = time.monotonic()
+    command_buffer = ""  # Serial input received so far that does not yet end in a newline
 
     while True:
         current_time = time.monotonic()
@@ -352,15 +442,26 @@ def control_loop():
             except Exception as e:
                 log_traceback_error(e)
 
-        # Listen for commands from the Pi
+        # Listen for commands from the Pi. Only the bytes already received are read, so a
+        # partially received command never blocks the loop; complete lines are dispatched.
         try:
-            if supervisor.runtime.serial_bytes_available:
-                command = input().strip()
-                handle_commands(command)
+            available = supervisor.runtime.serial_bytes_available
+            if available:
+                command_buffer += sys.stdin.read(available)
+                while "\n" in command_buffer:
+                    command, _, command_buffer = command_buffer.partition("\n")
+                    command = command.strip()
+                    if command:
+                        handle_commands(command)
 
         except Exception as e:
             log_traceback_error(e)
 
+        # Idle until the next reading is due, waking regularly to check for commands
+        remaining = cycle - (time.monotonic() - last_reading_time)
+        if remaining > 0:
+            time.sleep(min(remaining, COMMAND_POLL_INTERVAL))
+
 # Main program entry point
 if __name__ == "__main__":
     control_loop()